@@ -11,6 +11,8 @@ from __future__ import annotations
 
 import os
 
+import httpx
+
 
 class Settings:
     # Nuclio function endpoints
@@ -24,5 +26,18 @@ class Settings:
     MAX_UPLOAD_SIZE_MB: int = 10
     MAX_MESSAGE_LENGTH: int = 2000
 
+    # Default executor size for blocking work (file I/O, PDF extraction) off the event loop
+    BLOCKING_WORKERS: int = int(os.getenv("BLOCKING_WORKERS", "8"))
+    # Process pool for parallel page extraction of large PDFs
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
 
 settings = Settings()
+
+# Per-call deadlines for the shared httpx client. Passed per request so one
+# connection pool serves every upstream while each call keeps its own budget.
+HTTP_TIMEOUTS: dict[str, httpx.Timeout] = {
+    "agent": httpx.Timeout(180.0, connect=5.0),    # LLM reasoning can take time
+    "ingest": httpx.Timeout(60.0, connect=5.0),    # embed + Qdrant upsert
+    "session": httpx.Timeout(10.0, connect=2.0),   # session reset proxy
+}
@@ -0,0 +1,22 @@
+"""FastAPI dependencies shared across routers."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+from fastapi import Request
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Return the shared httpx.AsyncClient created in the app lifespan.
+
+    One pooled client serves every call to fn-ingest and fn-agent, so
+    keep-alive connections are reused instead of re-opened per request.
+    """
+    return request.app.state.http_client
+
+
+def get_pdf_pool(request: Request) -> ProcessPoolExecutor:
+    """Return the process pool used to extract large PDFs in parallel."""
+    return request.app.state.pdf_pool
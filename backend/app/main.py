@@ -14,23 +14,105 @@ NOT responsible for:
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import logging
+import multiprocessing
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
+import httpx
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from shared.logging_config import setup_logging
+from app.core.config import HTTP_TIMEOUTS, settings
+from app.core.dependencies import get_http_client
+from app.services.document_registry import get_registry
 from app.routers import upload, chat, jobs
 
 setup_logging()
+logger = logging.getLogger(__name__)
+
+# Streamed responses must reach the client as they are produced; GZip
+# would hold small chunks back in its compressor buffer.
+_UNCOMPRESSED_PATHS = frozenset({"/chat/stream"})
+
+
+class _GZipMiddleware(GZipMiddleware):
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] in _UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Load the document registry, start its flusher and open the shared HTTP client.
+
+    - Registry writes are coalesced by a background flush task; a final
+      flush on shutdown persists anything still pending.
+    - The HTTP client is pooled and reused by every call to fn-ingest /
+      fn-agent, so each request skips TCP connection setup.
+    - Blocking work (registry file I/O, PDF extraction) runs on the
+      default executor via asyncio.to_thread(). In-process PDFium calls
+      are serialised by a lock in pdf_service, since PDFium is not
+      thread-safe; large PDFs fan out to a process pool instead (spawned
+      lazily, so fork never copies our threads).
+    """
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.BLOCKING_WORKERS, thread_name_prefix="blocking")
+    )
+    app.state.pdf_pool = ProcessPoolExecutor(
+        max_workers=settings.PDF_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+    registry = get_registry()
+    await registry.load()
+    logger.info(
+        "Document registry ready: %d resumes, %d jobs",
+        registry.count_resumes(), registry.count_jobs(),
+    )
+    flusher = asyncio.create_task(registry.run_flusher())
+
+    # HTTP/2 stays off: the Nuclio runners are cleartext stdlib http.server
+    # endpoints, and httpx only negotiates h2 over TLS (ALPN). Idle pooled
+    # connections are kept for 30 s so bursts of chat/ingest calls reuse them.
+    app.state.http_client = httpx.AsyncClient(
+        http2=False,
+        limits=httpx.Limits(
+            max_keepalive_connections=20,
+            max_connections=100,
+            keepalive_expiry=30.0,
+        ),
+        timeout=HTTP_TIMEOUTS["agent"],
+    )
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
+        flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flusher
+        await registry.flush()
+        app.state.pdf_pool.shutdown(wait=False, cancel_futures=True)
+
 
 app = FastAPI(
     title="Career Intelligence Assistant — Gateway",
     version="3.0.0",
     description="API gateway: routes requests, orchestrates Nuclio function calls",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -40,6 +122,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it is the outermost layer: compresses the final body (> 1 KB)
+app.add_middleware(_GZipMiddleware, minimum_size=1024)
 
 app.include_router(upload.router, prefix="/upload", tags=["upload"])
 app.include_router(chat.router, tags=["chat"])
@@ -47,31 +131,21 @@ app.include_router(jobs.router, tags=["jobs", "metadata"])
 
 
 @app.delete("/session/{session_id}")
-async def proxy_reset_session(session_id: str) -> dict:
+async def proxy_reset_session(
+    session_id: str,
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> dict:
     """Proxy session reset to fn-agent."""
-    import httpx
-    from app.core.config import settings
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            await client.delete(f"{settings.NUCLIO_URL}/session/{session_id}")
-    except Exception:
-        pass
+        await client.delete(
+            f"{settings.NUCLIO_URL}/session/{session_id}",
+            timeout=HTTP_TIMEOUTS["session"],
+        )
+    except httpx.HTTPError:
+        pass  # best effort: fn-agent may be down or the session already gone
     return {"status": "ok", "session_id": session_id}
 
 
-@app.on_event("startup")
-async def startup_event() -> None:
-    import logging
-    logger = logging.getLogger(__name__)
-
-    from app.services.document_registry import get_registry
-    registry = get_registry()
-    logger.info(
-        "Document registry ready: %d resumes, %d jobs",
-        registry.count_resumes(), registry.count_jobs(),
-    )
-
-
 @app.get("/health")
 async def health() -> dict:
     return {"status": "ok"}
@@ -4,41 +4,43 @@ The backend no longer does vector retrieval. The nuclio-agent owns the full
 RAG + reasoning pipeline via LlamaIndex. The backend only:
 1. Validates the request.
 2. Forwards it to the agent with session_id and optional job_id.
-3. Returns the agent's response.
+3. Returns the agent's response — whole (/chat) or as an NDJSON stream of
+   answer deltas ending in a final {"done": true, "answer": ...} line
+   (/chat/stream).
 """
 
 from __future__ import annotations
 
 import logging
+from typing import AsyncIterator
 
-from fastapi import APIRouter, HTTPException
+import httpx
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from shared.models import AgentRequest, AgentResponse, ChatRequest, ChatResponse
 from app.core.config import settings
-from app.services.agent_client import call_agent
+from app.core.dependencies import get_http_client
+from app.services.agent_client import call_agent, open_agent_stream
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+async def chat(
+    request: ChatRequest,
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> ChatResponse:
     """Handle a user chat message.
 
     Forwards the query, session_id, and optional job_id to the
     LlamaIndex ReActAgent running in the Nuclio container.
     """
-    if len(request.message) > settings.MAX_MESSAGE_LENGTH:
-        raise HTTPException(status_code=400, detail="Message too long")
-
-    agent_request = AgentRequest(
-        query=request.message,
-        session_id=request.session_id,
-        job_id=request.job_id,
-    )
+    agent_request = _to_agent_request(request)
 
     try:
-        agent_response: AgentResponse = await call_agent(agent_request)
+        agent_response: AgentResponse = await call_agent(agent_request, client)
     except Exception as exc:
         logger.error("Agent call failed: %s", str(exc))
         raise HTTPException(status_code=502, detail="AI agent unavailable")
@@ -48,3 +50,49 @@ async def chat(request: ChatRequest) -> ChatResponse:
         sources=[],
         agent_reasoning=None,
     )
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> StreamingResponse:
+    """Like /chat, but relays the agent's answer as it is generated.
+
+    The body is fn-agent's NDJSON stream passed through unchanged, so the
+    user sees the first tokens instead of waiting for the full answer.
+    """
+    agent_request = _to_agent_request(request)
+
+    try:
+        upstream = await open_agent_stream(agent_request, client)
+    except Exception as exc:
+        logger.error("Agent stream failed: %s", str(exc))
+        raise HTTPException(status_code=502, detail="AI agent unavailable")
+
+    return StreamingResponse(
+        _relay(upstream),
+        media_type="application/x-ndjson",
+        # Stop nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _to_agent_request(request: ChatRequest) -> AgentRequest:
+    if len(request.message) > settings.MAX_MESSAGE_LENGTH:
+        raise HTTPException(status_code=400, detail="Message too long")
+    return AgentRequest(
+        query=request.message,
+        session_id=request.session_id,
+        job_id=request.job_id,
+    )
+
+
+async def _relay(upstream: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in upstream.aiter_raw():
+            yield chunk
+    except httpx.HTTPError as exc:
+        logger.error("Agent stream interrupted: %s", exc)
+    finally:
+        await upstream.aclose()
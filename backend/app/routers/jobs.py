@@ -1,8 +1,13 @@
-"""Job listing and document metadata endpoints."""
+"""Job listing and document metadata endpoints.
+
+All responses here are derived from the document registry, so they carry
+the registry ETag and answer If-None-Match with 304 Not Modified — repeat
+polls of unchanged data skip serialization entirely.
+"""
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from shared.models import DocumentRecord, JobInfo
 from app.services.job_store import list_jobs
@@ -10,19 +15,34 @@ from app.services.document_registry import get_registry
 
 router = APIRouter()
 
+# (registry etag, payload) — /metadata/stats is rebuilt only when the registry changes
+_cached_stats: tuple[str, dict] | None = None
+
+
+def _not_modified(request: Request, response: Response) -> Response | None:
+    """Tag the response with the registry ETag; return a 304 if the client has it."""
+    etag = get_registry().etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 
 @router.get("/jobs", response_model=list[JobInfo])
-async def get_jobs() -> list[JobInfo]:
+async def get_jobs(request: Request, response: Response) -> list[JobInfo] | Response:
     """Return all uploaded job descriptions.
 
     Used by the frontend JobSelector. Returns the legacy JobInfo format
     for backward compatibility.
     """
+    if not_modified := _not_modified(request, response):
+        return not_modified
     return list_jobs()
 
 
 @router.get("/metadata/documents", response_model=list[DocumentRecord])
-async def get_all_documents() -> list[DocumentRecord]:
+async def get_all_documents(request: Request, response: Response) -> list[DocumentRecord] | Response:
     """Return the full document registry — all uploaded resumes and jobs.
 
     Includes document_type, filename, upload_timestamp, is_active, and
@@ -32,6 +52,8 @@ async def get_all_documents() -> list[DocumentRecord]:
       - Which resume is active?
       - When was a document uploaded?
     """
+    if not_modified := _not_modified(request, response):
+        return not_modified
     registry = get_registry()
     jobs = registry.list_jobs()
     resumes = registry.list_resumes()
@@ -39,20 +61,30 @@ async def get_all_documents() -> list[DocumentRecord]:
 
 
 @router.get("/metadata/resume/active", response_model=DocumentRecord | None)
-async def get_active_resume() -> DocumentRecord | None:
+async def get_active_resume(request: Request, response: Response) -> DocumentRecord | None | Response:
     """Return the currently active resume record, or null if none uploaded."""
+    if not_modified := _not_modified(request, response):
+        return not_modified
     return get_registry().get_active_resume()
 
 
-@router.get("/metadata/stats")
-async def get_metadata_stats() -> dict:
+@router.get("/metadata/stats", response_model=None)
+async def get_metadata_stats(request: Request, response: Response) -> dict | Response:
     """Return a summary of uploaded document counts.
 
-    Suitable for a quick metadata panel in the UI.
+    Suitable for a quick metadata panel in the UI. The payload is memoized
+    per registry version.
     """
+    global _cached_stats
+    if not_modified := _not_modified(request, response):
+        return not_modified
     registry = get_registry()
+    etag = registry.etag
+    if _cached_stats is not None and _cached_stats[0] == etag:
+        return _cached_stats[1]
+
     active_resume = registry.get_active_resume()
-    return {
+    payload = {
         "total_resumes": registry.count_resumes(),
         "total_jobs": registry.count_jobs(),
         "active_resume": active_resume.filename if active_resume else None,
@@ -69,3 +101,5 @@ async def get_metadata_stats() -> dict:
             for r in registry.list_jobs()
         ],
     }
+    _cached_stats = (etag, payload)
+    return payload
@@ -11,22 +11,57 @@ The backend never loads ML models or writes to Qdrant directly.
 from __future__ import annotations
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from typing import Callable
 from uuid import uuid4
 
-from fastapi import APIRouter, File, UploadFile, HTTPException
+import httpx
+from fastapi import APIRouter, Depends, File, Request, Response, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
 
 from shared.models import DocumentRecord, DocumentType, JobInfo
 from app.core.config import settings
-from app.services.pdf_service import extract_text_from_pdf
+from app.core.dependencies import get_http_client, get_pdf_pool
+from app.services.pdf_service import extract_text_from_pdf_async
 from app.services.fn_client import call_ingest
 from app.services.job_store import add_job, job_collection_name
 from app.services.document_registry import get_registry
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
 
 MAX_SIZE = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+_MULTIPART_OVERHEAD = 16 * 1024  # boundaries + part headers around the file
+_TITLE_SCAN_CHARS = 2048  # titles live at the top; never split the whole document
+
+
+class _SizeLimitedRoute(APIRoute):
+    """Reject oversized uploads from Content-Length before the body is read.
+
+    FastAPI parses multipart bodies before the endpoint (or any dependency)
+    runs, so this check has to wrap the route handler itself. Requests
+    without Content-Length (chunked) fall through to the size check in
+    _read_content().
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def size_limited_handler(request: Request) -> Response:
+            content_length = request.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > MAX_SIZE + _MULTIPART_OVERHEAD:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Max {settings.MAX_UPLOAD_SIZE_MB} MB.",
+                )
+            return await handler(request)
+
+        return size_limited_handler
+
+
+router = APIRouter(route_class=_SizeLimitedRoute)
 
 
 def _validate_file(file: UploadFile) -> None:
@@ -37,30 +72,53 @@ def _validate_file(file: UploadFile) -> None:
         )
 
 
-async def _read_content(file: UploadFile) -> str:
-    content = await file.read()
-    if len(content) > MAX_SIZE:
+def _extract_title(text: str) -> str | None:
+    """Return the first non-empty line of the document, or None."""
+    head = text[:_TITLE_SCAN_CHARS]
+    return next((ln.strip() for ln in head.splitlines() if ln.strip()), None)
+
+
+async def _read_content(file: UploadFile, pdf_pool: ProcessPoolExecutor) -> str:
+    """Check the upload's size and extract its text.
+
+    By the time the endpoint runs, Starlette has already spooled the whole
+    multipart part into file.file (in memory up to 1 MB, then on disk), so
+    the size check reads nothing and the PDF reader gets that spool
+    directly. Extraction runs off the event loop (thread, or process pool
+    for large PDFs, which are read into bytes once for the workers).
+    """
+    size = file.size
+    if size is None:  # not recorded by the parser: measure the spool instead
+        size = await run_in_threadpool(file.file.seek, 0, os.SEEK_END)
+    if size > MAX_SIZE:
         raise HTTPException(
-            status_code=400,
+            status_code=413,  # same status as _SizeLimitedRoute's early check
             detail=f"File too large. Max {settings.MAX_UPLOAD_SIZE_MB} MB.",
         )
+    await file.seek(0)
+
     if file.content_type == "application/pdf":
         try:
-            return extract_text_from_pdf(content)
+            return await extract_text_from_pdf_async(file.file, pdf_pool)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
-    return content.decode("utf-8", errors="replace")
+    # UploadFile.read() moves reads of an on-disk spool off the event loop
+    return (await file.read()).decode("utf-8", errors="replace")
 
 
 @router.post("/resume")
-async def upload_resume(file: UploadFile = File(...)) -> dict:
+async def upload_resume(
+    file: UploadFile = File(...),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    pdf_pool: ProcessPoolExecutor = Depends(get_pdf_pool),
+) -> dict:
     """Upload a resume PDF or text file.
 
     Extracts text, then delegates chunking + embedding to fn-ingest.
     Updates the document registry to mark this resume as active.
     """
     _validate_file(file)
-    text = await _read_content(file)
+    text = await _read_content(file, pdf_pool)
 
     collection = settings.RESUME_COLLECTION
 
@@ -69,6 +127,7 @@ async def upload_resume(file: UploadFile = File(...)) -> dict:
             text=text,
             collection_name=collection,
             source=DocumentType.RESUME,
+            client=client,
         )
     except Exception as exc:
         logger.error("fn-ingest unavailable: %s", exc)
@@ -78,10 +137,10 @@ async def upload_resume(file: UploadFile = File(...)) -> dict:
 
     # Registry: deactivate previous resumes, register the new one
     registry = get_registry()
-    registry.deactivate_resumes()
+    await registry.deactivate_resumes()
 
     document_id = str(uuid4())
-    registry.register(DocumentRecord(
+    await registry.register(DocumentRecord(
         document_id=document_id,
         document_type="resume",
         filename=file.filename or "resume",
@@ -104,7 +163,11 @@ async def upload_resume(file: UploadFile = File(...)) -> dict:
 
 
 @router.post("/job")
-async def upload_job(file: UploadFile = File(...)) -> dict:
+async def upload_job(
+    file: UploadFile = File(...),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    pdf_pool: ProcessPoolExecutor = Depends(get_pdf_pool),
+) -> dict:
     """Upload a job description PDF or text file.
 
     Extracts text, then delegates chunking + embedding to fn-ingest.
@@ -112,16 +175,19 @@ async def upload_job(file: UploadFile = File(...)) -> dict:
     Registers the job in the persistent document registry.
     """
     _validate_file(file)
-    text = await _read_content(file)
+    text = await _read_content(file, pdf_pool)
 
     job_id = str(uuid4())[:8]
     collection = job_collection_name(job_id)
 
+    title = _extract_title(text)
+
     try:
         result = await call_ingest(
             text=text,
             collection_name=collection,
             source=DocumentType.JOB,
+            client=client,
             job_id=job_id,
         )
     except Exception as exc:
@@ -129,14 +195,12 @@ async def upload_job(file: UploadFile = File(...)) -> dict:
         raise HTTPException(status_code=502, detail="Ingest service unavailable")
 
     chunk_count = result.get("chunks", 0)
-
-    title = next((ln.strip() for ln in text.splitlines() if ln.strip()), None)
     title = (title or file.filename or "Untitled")[:100]
 
     add_job(JobInfo(job_id=job_id, title=title, filename=file.filename or "unknown"))
 
     document_id = str(uuid4())
-    get_registry().register(DocumentRecord(
+    await get_registry().register(DocumentRecord(
         document_id=document_id,
         document_type="job_description",
         filename=file.filename or "unknown",
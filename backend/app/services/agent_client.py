@@ -8,21 +8,21 @@ import time
 import httpx
 
 from shared.models import AgentRequest, AgentResponse
-from app.core.config import settings
+from app.core.config import HTTP_TIMEOUTS, settings
 
 logger = logging.getLogger(__name__)
 
-TIMEOUT = 180.0  # LLM reasoning can take time
 
+async def call_agent(request: AgentRequest, client: httpx.AsyncClient) -> AgentResponse:
+    """Send a request to the Nuclio LlamaIndex agent and return the response.
 
-async def call_agent(request: AgentRequest) -> AgentResponse:
-    """Send a request to the Nuclio LlamaIndex agent and return the response."""
+    ``client`` is the shared, connection-pooled client from the app lifespan.
+    """
     url = f"{settings.NUCLIO_URL}/agent"
     start = time.perf_counter()
 
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        resp = await client.post(url, json=request.model_dump())
-        resp.raise_for_status()
+    resp = await client.post(url, json=request.model_dump(), timeout=HTTP_TIMEOUTS["agent"])
+    resp.raise_for_status()
 
     latency_ms = (time.perf_counter() - start) * 1000
     logger.info(
@@ -33,3 +33,25 @@ async def call_agent(request: AgentRequest) -> AgentResponse:
 
     data = resp.json()
     return AgentResponse(**data)
+
+
+async def open_agent_stream(request: AgentRequest, client: httpx.AsyncClient) -> httpx.Response:
+    """Start a streamed agent call and return the open response.
+
+    Raises before any body is read if fn-agent is unreachable or returns an
+    error status, so the caller can still answer with a normal error.
+    The caller must aclose() the returned response.
+    """
+    url = f"{settings.NUCLIO_URL}/agent"
+    payload = request.model_copy(update={"stream": True}).model_dump()
+    resp = await client.send(
+        client.build_request("POST", url, json=payload, timeout=HTTP_TIMEOUTS["agent"]),
+        stream=True,
+    )
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError:
+        await resp.aclose()
+        raise
+    logger.info("Agent stream opened session=%s", request.session_id)
+    return resp
@@ -6,124 +6,233 @@ Tracks all uploaded documents with full provenance:
 
 This is the authoritative source of truth for metadata queries.
 Metadata answers (counts, lists, active resume) are served directly from
-this registry — no LLM reasoning required.
+this registry — no LLM reasoning required. Jobs and resumes are kept in
+per-type dicts ordered by upload time, so reads never filter or re-sort.
 
 Storage: /app/uploads/document_registry.json (mounted Docker volume).
-Thread-safe via threading.Lock.
+All callers run on the event loop; mutations are serialized with an
+asyncio.Lock so they compose with awaits. Writes are coalesced: mutations only mark
+the registry dirty, and a background task (run_flusher, started from the
+app lifespan) persists at most once per FLUSH_INTERVAL_S. All disk I/O
+(load() and flush()) runs in a worker thread, never on the event loop.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import threading
+import os
 from pathlib import Path
 from typing import Optional
+from uuid import uuid4
+
+import orjson
 
 from shared.models import DocumentRecord
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_PATH = Path("/app/uploads/document_registry.json")
+FLUSH_INTERVAL_S = 0.5
 
 
 class DocumentRegistry:
-    """Thread-safe JSON-file-backed document registry."""
+    """Event-loop-safe JSON-file-backed document registry."""
 
     def __init__(self, storage_path: Path = _DEFAULT_PATH) -> None:
         self._path = storage_path
-        self._lock = threading.Lock()
+        self._lock = asyncio.Lock()          # guards in-memory state
+        self._write_lock = asyncio.Lock()    # orders snapshots written to disk
         self._records: dict[str, DocumentRecord] = {}
-        self._load()
+        # Typed indices, insertion-ordered by upload_timestamp (oldest first)
+        self._jobs: dict[str, DocumentRecord] = {}
+        self._resumes: dict[str, DocumentRecord] = {}
+        self._active_resume_id: Optional[str] = None
+        # document_id → JSON-ready dict, refreshed only for records that change
+        self._json_cache: dict[str, dict] = {}
+        self._dirty = False
+        # Bumped on every mutation; with the per-process boot id it forms the
+        # ETag for metadata endpoints (a restart never reuses an old tag).
+        self._version = 0
+        self._boot_id = uuid4().hex[:8]
 
     # ------------------------------------------------------------------
     # Write operations
     # ------------------------------------------------------------------
 
-    def register(self, record: DocumentRecord) -> None:
-        """Add or update a document record, then persist to disk."""
-        with self._lock:
+    async def register(self, record: DocumentRecord) -> None:
+        """Add or update a document record; persisted by the next flush."""
+        async with self._lock:
             self._records[record.document_id] = record
-            self._save()
+            self._json_cache[record.document_id] = record.model_dump(mode="json")
+            self._index(record)
+            self._dirty = True
+            self._version += 1
         logger.info(
             "Registered document: id=%s type=%s file=%s",
             record.document_id, record.document_type, record.filename,
         )
 
-    def deactivate_resumes(self) -> None:
+    async def deactivate_resumes(self) -> None:
         """Mark all existing resumes as inactive before uploading a new one."""
-        with self._lock:
-            changed = False
-            for doc_id, record in self._records.items():
-                if record.document_type == "resume" and record.is_active:
-                    self._records[doc_id] = record.model_copy(update={"is_active": False})
-                    changed = True
-            if changed:
-                self._save()
+        async with self._lock:
+            for doc_id, record in self._resumes.items():
+                if record.is_active:
+                    inactive = record.model_copy(update={"is_active": False})
+                    self._resumes[doc_id] = self._records[doc_id] = inactive
+                    self._json_cache[doc_id] = inactive.model_dump(mode="json")
+                    self._dirty = True
+                    self._version += 1
+            self._active_resume_id = None
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    async def load(self) -> None:
+        """Read the registry file from disk (in a worker thread)."""
+        await asyncio.to_thread(self._load_sync)
+
+    async def flush(self) -> None:
+        """Persist pending changes to disk, if any (write in a worker thread).
+
+        The snapshot is a shallow copy of the per-record JSON cache, taken
+        under _lock — O(1) work per record, no re-serialization of unchanged
+        records, and mutators never wait for the disk write. _write_lock is held throughout so
+        an older snapshot can never land on disk after a newer one.
+        """
+        async with self._write_lock:
+            async with self._lock:
+                if not self._dirty:
+                    return
+                data = dict(self._json_cache)
+                self._dirty = False
+            try:
+                await asyncio.to_thread(self._save_sync, data)
+            except Exception:
+                self._dirty = True  # retry on the next flush
+                raise
+
+    async def run_flusher(self, interval: float = FLUSH_INTERVAL_S) -> None:
+        """Background task: collapse bursts of writes into one save per interval.
+
+        Runs until cancelled; the caller should flush() once more on shutdown.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self._dirty:
+                try:
+                    await self.flush()
+                except Exception as exc:
+                    logger.error("Registry flush to %s failed: %s", self._path, exc)
 
     # ------------------------------------------------------------------
-    # Read operations (no lock needed — dict reads are thread-safe in CPython)
+    # Read operations (no lock needed — reads and writes share the event loop)
     # ------------------------------------------------------------------
 
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every mutation."""
+        return self._version
+
+    @property
+    def etag(self) -> str:
+        """Weak ETag identifying the current registry contents."""
+        return f'W/"{self._boot_id}-{self._version}"'
+
     def get(self, document_id: str) -> Optional[DocumentRecord]:
         return self._records.get(document_id)
 
     def list_jobs(self) -> list[DocumentRecord]:
         """Return all job_description records sorted by upload time (oldest first)."""
-        return sorted(
-            (r for r in self._records.values() if r.document_type == "job_description"),
-            key=lambda r: r.upload_timestamp,
-        )
+        return list(self._jobs.values())
 
     def list_resumes(self) -> list[DocumentRecord]:
         """Return all resume records sorted by upload time."""
-        return sorted(
-            (r for r in self._records.values() if r.document_type == "resume"),
-            key=lambda r: r.upload_timestamp,
-        )
+        return list(self._resumes.values())
 
     def get_active_resume(self) -> Optional[DocumentRecord]:
         """Return the most recently activated resume, or None."""
-        active = [r for r in self._records.values()
-                  if r.document_type == "resume" and r.is_active]
-        if active:
-            return max(active, key=lambda r: r.upload_timestamp)
+        if self._active_resume_id is not None:
+            return self._resumes[self._active_resume_id]
         # Fall back to most recent resume even if not marked active
-        resumes = self.list_resumes()
-        return resumes[-1] if resumes else None
+        if self._resumes:
+            return next(reversed(self._resumes.values()))
+        return None
 
     def count_jobs(self) -> int:
-        return sum(1 for r in self._records.values() if r.document_type == "job_description")
+        return len(self._jobs)
 
     def count_resumes(self) -> int:
-        return sum(1 for r in self._records.values() if r.document_type == "resume")
+        return len(self._resumes)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _index(self, record: DocumentRecord) -> None:
+        """Place a record in its typed index. Caller must hold self._lock (or be loading).
+
+        Uploads arrive in time order, so this is normally an append; an
+        out-of-order timestamp triggers a one-off re-sort of that index.
+        """
+        index = self._jobs if record.document_type == "job_description" else self._resumes
+        last = next(reversed(index.values()), None)
+        index[record.document_id] = record
+        if last is not None and record.upload_timestamp < last.upload_timestamp:
+            ordered = sorted(index.values(), key=lambda r: r.upload_timestamp)
+            index.clear()
+            index.update((r.document_id, r) for r in ordered)
+
+        if record.document_type == "resume":
+            current = self._resumes.get(self._active_resume_id) if self._active_resume_id else None
+            if record.is_active and (
+                current is None or record.upload_timestamp >= current.upload_timestamp
+            ):
+                self._active_resume_id = record.document_id
+            elif not record.is_active and self._active_resume_id == record.document_id:
+                self._active_resume_id = None
 
     # ------------------------------------------------------------------
     # Persistence helpers
     # ------------------------------------------------------------------
 
-    def _load(self) -> None:
+    def _load_sync(self) -> None:
         if not self._path.exists():
             logger.info("No registry file found at %s — starting empty", self._path)
             return
         try:
-            data = json.loads(self._path.read_text())
-            self._records = {k: DocumentRecord(**v) for k, v in data.items()}
+            data = orjson.loads(self._path.read_bytes())
+            records = sorted(
+                (DocumentRecord(**v) for v in data.values()),
+                key=lambda r: r.upload_timestamp,
+            )
+            self._records = {r.document_id: r for r in records}
+            self._json_cache = {r.document_id: r.model_dump(mode="json") for r in records}
+            for record in records:
+                self._index(record)
             logger.info(
                 "Registry loaded: %d total records (%d jobs, %d resumes)",
                 len(self._records), self.count_jobs(), self.count_resumes(),
             )
         except Exception as exc:
             logger.error("Failed to load registry from %s: %s", self._path, exc)
-            self._records = {}
+            self._records, self._jobs, self._resumes, self._json_cache = {}, {}, {}, {}
+            self._active_resume_id = None
+
+    def _save_sync(self, data: dict) -> None:
+        """Atomically write a registry snapshot to disk.
 
-    def _save(self) -> None:
-        """Atomically write registry to disk. Caller must hold self._lock."""
+        The sibling temp file is fsynced before the rename so a crash leaves
+        either the old registry or the complete new one, never a truncated file.
+        """
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self._path.with_suffix(".tmp")
-        data = {k: json.loads(v.model_dump_json()) for k, v in self._records.items()}
-        tmp.write_text(json.dumps(data, indent=2))
-        tmp.replace(self._path)  # atomic rename
+        tmp = self._path.parent / (self._path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path)  # atomic rename
 
 
 # ---------------------------------------------------------------------------
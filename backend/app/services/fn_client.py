@@ -13,39 +13,42 @@ import logging
 
 import httpx
 
-from app.core.config import settings
+from app.core.config import HTTP_TIMEOUTS, settings
 
 logger = logging.getLogger(__name__)
 
-_INGEST_TIMEOUT = 60.0   # embed + Qdrant upsert
-_AGENT_TIMEOUT = 180.0   # LLM reasoning can be slow
-
 
 async def call_ingest(
     text: str,
     collection_name: str,
     source: str,
+    client: httpx.AsyncClient,
     job_id: str | None = None,
 ) -> dict:
     """Delegate document ingestion to fn-ingest.
 
     fn-ingest chunks the text, embeds with BAAI/bge-small-en-v1.5,
-    and upserts to the specified Qdrant collection.
+    and upserts to the specified Qdrant collection. The text is sent as the
+    raw UTF-8 body with metadata in headers — no JSON string escaping of
+    a potentially 500 KB document.
+
+    ``client`` is the shared, connection-pooled client from the app lifespan.
 
     Returns:
         {"status": "ok", "chunks": int, "collection": str}
     """
-    async with httpx.AsyncClient(timeout=_INGEST_TIMEOUT) as client:
-        resp = await client.post(
-            f"{settings.FN_INGEST_URL}/",
-            json={
-                "text": text,
-                "collection_name": collection_name,
-                "source": source,
-                "job_id": job_id,
-            },
-        )
-        resp.raise_for_status()
+    resp = await client.post(
+        f"{settings.FN_INGEST_URL}/",
+        content=text.encode("utf-8"),
+        headers={
+            "Content-Type": "text/plain; charset=utf-8",
+            "X-Collection": collection_name,
+            "X-Source": source,
+            "X-Job-Id": job_id or "",
+        },
+        timeout=HTTP_TIMEOUTS["ingest"],
+    )
+    resp.raise_for_status()
 
     result = resp.json()
     logger.info(
@@ -2,7 +2,7 @@ import React, { useState, useEffect, useCallback, useRef } from 'react'
 import FileUpload from './components/FileUpload'
 import JobSelector from './components/JobSelector'
 import ChatWindow from './components/ChatWindow'
-import { uploadResume, uploadJob, fetchJobs, sendChat } from './services/api'
+import { uploadResume, uploadJob, fetchJobs, sendChatStream } from './services/api'
 
 function generateSessionId() {
   return 'session-' + Math.random().toString(36).slice(2) + Date.now().toString(36)
@@ -35,10 +35,10 @@ export default function App() {
     return result
   }
 
-  const handleChat = async (message) => {
+  const handleChat = async (message, onDelta) => {
     setChatLoading(true)
     try {
-      return await sendChat(message, selectedJob, sessionId)
+      return await sendChatStream(message, selectedJob, sessionId, onDelta)
     } finally {
       setChatLoading(false)
     }
@@ -8,12 +8,17 @@ export default function ChatWindow({ onSend, loading }) {
     const text = input.trim()
     if (!text || loading) return
     setInput('')
-    setMessages((prev) => [...prev, { role: 'user', content: text }])
+    setMessages((prev) => [...prev, { role: 'user', content: text }, { role: 'assistant', content: '' }])
+    // Replace the trailing assistant placeholder as the answer streams in
+    const setAnswer = (update) =>
+      setMessages((prev) => [...prev.slice(0, -1), update(prev[prev.length - 1])])
     try {
-      const res = await onSend(text)
-      setMessages((prev) => [...prev, { role: 'assistant', content: res.answer }])
+      const res = await onSend(text, (delta) =>
+        setAnswer((m) => ({ ...m, content: m.content + delta })),
+      )
+      setAnswer((m) => ({ ...m, content: res.answer }))
     } catch (err) {
-      setMessages((prev) => [...prev, { role: 'error', content: err.message }])
+      setAnswer(() => ({ role: 'error', content: err.message }))
     }
   }
 
@@ -42,7 +47,7 @@ export default function ChatWindow({ onSend, loading }) {
             Upload a resume and job description, then ask questions here.
           </div>
         )}
-        {messages.map((m, i) => (
+        {messages.map((m, i) => m.content === '' ? null : (
           <div
             key={i}
             style={{
@@ -58,7 +63,7 @@ export default function ChatWindow({ onSend, loading }) {
             <div style={{ marginTop: 4 }}>{m.content}</div>
           </div>
         ))}
-        {loading && (
+        {loading && !messages[messages.length - 1]?.content && (
           <div style={{ color: '#888', fontStyle: 'italic' }}>Thinking...</div>
         )}
       </div>
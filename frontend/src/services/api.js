@@ -34,6 +34,39 @@ export async function sendChat(message, jobId, sessionId) {
   return res.json()
 }
 
+// Streams the answer: onDelta(text) is called as tokens arrive and the
+// final {done, answer, ...} payload is returned.
+export async function sendChatStream(message, jobId, sessionId, onDelta) {
+  const body = { message, session_id: sessionId }
+  if (jobId) body.job_id = jobId
+  const res = await fetch(`${BASE}/chat/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+  })
+  if (!res.ok) throw new Error((await res.json()).detail || 'Chat failed')
+
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    let newline
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+      const line = buffer.slice(0, newline).trim()
+      buffer = buffer.slice(newline + 1)
+      if (!line) continue
+      const event = JSON.parse(line)
+      if (event.error) throw new Error(event.error)
+      if (event.done) return event
+      if (event.delta) onDelta(event.delta)
+    }
+  }
+  throw new Error('Chat stream ended unexpectedly')
+}
+
 export async function resetSession(sessionId) {
   await fetch(`${BASE}/session/${sessionId}`, { method: 'DELETE' })
 }
@@ -5,7 +5,7 @@ ONCE from init_context(). No module-level model loading — no side effects
 on import.
 
 Public API:
-  build_components(ollama_base_url, qdrant_host, qdrant_port) -> dict
+  build_components(ollama_base_url, qdrant_host, qdrant_port, qdrant_grpc_port) -> dict
     Returns a dict of all initialized AI components.
 
   get_or_create_agent(sessions, tools, llm, session_id) -> ReActAgent
@@ -15,9 +15,12 @@ Public API:
 from __future__ import annotations
 
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+_sessions_lock = threading.Lock()  # requests arrive on concurrent threads
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -25,6 +28,11 @@ logger = logging.getLogger(__name__)
 EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
 LLM_MODEL = "llama3.1:8b"
 LLM_TIMEOUT = 180.0
+OLLAMA_CONNECT_TIMEOUT = 2.0  # Ollama runs next door — fail fast if it is down
+QDRANT_TIMEOUT = 30  # seconds, per Qdrant request
+QDRANT_GRPC_KEEPALIVE_MS = 30_000  # ping an idle gRPC channel so it is not silently dropped
+LLM_CONTEXT_WINDOW = 4096
+CLASSIFIER_MAX_TOKENS = 96  # the classification JSON object is ~60 tokens
 MEMORY_TOKEN_LIMIT = 2048
 AGENT_MAX_ITERATIONS = 10
 
@@ -70,6 +78,7 @@ def build_components(
     ollama_base_url: str,
     qdrant_host: str,
     qdrant_port: int,
+    qdrant_grpc_port: int = 0,
 ) -> dict:
     """Build and return all AI components.
 
@@ -78,22 +87,48 @@ def build_components(
     """
     from llama_index.core import Settings
     from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+    import httpx
     from llama_index.llms.ollama import Ollama
+    from ollama import Client as OllamaClient
     from qdrant_client import QdrantClient
 
     from indexes.index_store import IndexStore
     from services.qdrant_reader import QdrantReader
     from tools import build_all_tools
 
+    # One keep-alive connection pool for every synchronous Ollama call (chat
+    # LLM, classifier, warm-up) instead of one client per Ollama wrapper.
+    # retries=1 retries failed connects only, never a sent request.
+    ollama_client = OllamaClient(
+        host=ollama_base_url,
+        timeout=httpx.Timeout(LLM_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT),
+        transport=httpx.HTTPTransport(retries=1),
+    )
+
     logger.info("Loading LLM: %s via %s", LLM_MODEL, ollama_base_url)
     llm = Ollama(
         model=LLM_MODEL,
         base_url=ollama_base_url,
         request_timeout=LLM_TIMEOUT,
+        client=ollama_client,
         # llama3.1:8b defaults to a 128K context window which requires ~20 GB.
         # 4096 tokens is sufficient for this use case and fits in 16 GB RAM.
-        context_window=4096,
-        additional_kwargs={"options": {"num_ctx": 4096}},
+        context_window=LLM_CONTEXT_WINDOW,
+        additional_kwargs={"options": {"num_ctx": LLM_CONTEXT_WINDOW}},
+    )
+
+    # Same model and context size (so Ollama never reloads it), but with
+    # constrained JSON decoding and a hard output cap for intent
+    # classification. temperature=0 makes routing deterministic.
+    classifier_llm = Ollama(
+        model=LLM_MODEL,
+        base_url=ollama_base_url,
+        request_timeout=LLM_TIMEOUT,
+        context_window=LLM_CONTEXT_WINDOW,
+        client=ollama_client,
+        json_mode=True,
+        temperature=0.0,
+        additional_kwargs={"num_predict": CLASSIFIER_MAX_TOKENS},
     )
 
     logger.info("Loading embedding model: %s", EMBEDDING_MODEL)
@@ -104,7 +139,24 @@ def build_components(
     Settings.embed_model = embed_model
     Settings.chunk_size = 512
 
-    qdrant_client = QdrantClient(host=qdrant_host, port=qdrant_port, check_compatibility=False)
+    # With a gRPC port, scrolls and retrieves go over gRPC: points arrive as
+    # protobuf rather than JSON. The client keeps qdrant_port for the few
+    # calls it only implements over REST.
+    if qdrant_grpc_port:
+        qdrant_client = QdrantClient(
+            host=qdrant_host,
+            port=qdrant_port,
+            grpc_port=qdrant_grpc_port,
+            prefer_grpc=True,
+            timeout=QDRANT_TIMEOUT,
+            grpc_options={"grpc.keepalive_time_ms": QDRANT_GRPC_KEEPALIVE_MS},
+            check_compatibility=False,
+        )
+    else:
+        qdrant_client = QdrantClient(
+            host=qdrant_host, port=qdrant_port, timeout=QDRANT_TIMEOUT, check_compatibility=False,
+        )
+    logger.info("Qdrant transport: %s", "gRPC" if qdrant_grpc_port else "REST")
     index_store = IndexStore(qdrant_client=qdrant_client, embed_model=embed_model)
     qdrant_reader = QdrantReader(client=qdrant_client)
 
@@ -120,6 +172,8 @@ def build_components(
     )
     return {
         "llm": llm,
+        "classifier_llm": classifier_llm,
+        "ollama_client": ollama_client,
         "embed_model": embed_model,
         "index_store": index_store,
         "qdrant_reader": qdrant_reader,
@@ -143,6 +197,11 @@ def get_or_create_agent(sessions: dict, tools: list, llm, session_id: str):
     Note: llama-index >=0.14 replaced ReActAgent.from_tools() with a direct
     constructor and made agent invocation async (agent.run() → WorkflowHandler).
     """
+    with _sessions_lock:
+        return _get_or_create_locked(sessions, tools, llm, session_id)
+
+
+def _get_or_create_locked(sessions: dict, tools: list, llm, session_id: str):
     if session_id not in sessions:
         from llama_index.core.agent import ReActAgent
         from llama_index.core.memory import ChatMemoryBuffer
@@ -152,7 +211,10 @@ def get_or_create_agent(sessions: dict, tools: list, llm, session_id: str):
             tools=tools,
             llm=llm,
             verbose=True,
-            streaming=False,
+            # Streams each step's LLM output as AgentStream events: relayed to
+            # stream=true clients, drained and discarded for blocking calls
+            # (one agent serves both); the awaited result is the same either way.
+            streaming=True,
             system_prompt=SYSTEM_PROMPT,
             timeout=LLM_TIMEOUT,
         )
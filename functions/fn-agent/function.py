@@ -6,24 +6,65 @@ Nuclio function contract:
 
 Routes handled:
   POST /agent                  { query, session_id, job_id? }  → agent chat
+  POST /agent                  { ..., stream: true }           → agent chat, NDJSON stream
+  POST /agent/batch            { queries, session_id, job_id? } → several turns, batched classifier calls
   DELETE /session/{session_id}                                  → clear session memory
 
+Streamed responses are newline-delimited JSON: zero or more
+{"delta": "..."} lines as answer text is generated, then one final
+{"done": true, "answer", "session_id", "intent", "routed_via"} line
+(or {"error": "..."} if routing fails mid-stream). The final answer is
+authoritative; deltas are for progressive display only.
+
 Session memory (ReActAgent per session) is stored in context.user_data.sessions.
 This is intentional in-process state — Nuclio functions support it.
+
+Requests are handled on concurrent threads (ThreadingHTTPServer). All async
+agent work runs on one persistent event loop in a dedicated thread; request
+threads submit to it with run_coroutine_threadsafe(). Turns within the same
+session are serialised so a session's memory is never updated concurrently.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
+import queue
+import sys
+import threading
 from dataclasses import dataclass
+from typing import Callable, Optional
+
+import orjson
+
+# Real Nuclio does not put the function directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from llama_index.core.agent.workflow import AgentStream
+from llama_index.core.llms import ChatMessage, MessageRole
+
+from agents.career_agent import (
+    AGENT_MAX_ITERATIONS,
+    SYSTEM_PROMPT,
+    build_components,
+    get_or_create_agent,
+)
+from router.intent_cache import IntentCache
+from router.intent_classifier import (
+    IntentClassification,
+    classify_intent,
+    classify_intents_batch,
+    handle_metadata_query,
+)
 
 logger = logging.getLogger(__name__)
 
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))  # 0 = REST only
+MAX_BATCH_QUERIES = 32  # per POST /agent/batch; every query is a full agent turn
 
 
 # ---------------------------------------------------------------------------
@@ -32,9 +73,11 @@ QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
 
 @dataclass
 class Response:
-    body: str = ""
+    body: bytes | str = b""
     status_code: int = 200
     content_type: str = "application/json"
+    # If set, called with a write(bytes) function instead of sending body
+    stream: Optional[Callable[[Callable[[bytes], None]], None]] = None
 
 
 # ---------------------------------------------------------------------------
@@ -44,48 +87,72 @@ class Response:
 def init_context(context) -> None:
     """Load all AI components ONCE at startup.
 
-    Building LLM + embedding model + 7 tools takes ~15-30s.
-    After init_context() returns, every request is fast.
+    Building LLM + embedding model + 7 tools takes ~15-30s, plus a few
+    seconds to warm the models (see _warm_up). After init_context()
+    returns, every request — including the first — is fast.
     """
-    import sys
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
     context.logger.info("Initialising fn-agent ...")
 
-    from agents.career_agent import build_components
-
     components = build_components(
         ollama_base_url=OLLAMA_BASE_URL,
         qdrant_host=QDRANT_HOST,
         qdrant_port=QDRANT_PORT,
+        qdrant_grpc_port=QDRANT_GRPC_PORT,
     )
 
     context.user_data.llm = components["llm"]
+    context.user_data.classifier_llm = components["classifier_llm"]
     context.user_data.qdrant_reader = components["qdrant_reader"]
     context.user_data.tools = components["tools"]
+    context.user_data.intent_cache = IntentCache(embed_model=components["embed_model"])
     context.user_data.sessions = {}  # session_id → (ReActAgent, ChatMemoryBuffer)
+    context.user_data.turn_locks = {}  # session_id → threading.Lock, one turn at a time
+    context.user_data.turn_locks_guard = threading.Lock()
 
-    # Persistent event loop reused across ALL requests.
+    # Persistent event loop reused across ALL requests, running in its own thread.
     # asyncio.run() closes the loop after each call; the workflow-based ReActAgent
     # (llama-index >=0.14) schedules asyncio.Tasks that become invalid once the
-    # loop is closed. Reusing one loop keeps those tasks valid across requests.
-    import asyncio
+    # loop is closed. Reusing one loop keeps those tasks valid across requests,
+    # and running it forever lets concurrent request threads share it.
     loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True).start()
     context.user_data.loop = loop
 
+    _warm_up(context, components)
+
     context.logger.info(f"fn-agent ready: {len(components['tools'])} tools loaded")
 
 
+def _warm_up(context, components: dict) -> None:
+    """Load the models before traffic arrives, so no user pays for it.
+
+    Ollama loads the model into memory on the first request after startup
+    (multi-second), and the embedding model's first forward pass is slow
+    too. The classifier client shares the model and context size of the
+    chat LLM and caps output tokens, so it warms the model cheaply.
+    Failures are logged, not raised — Ollama may still be starting up.
+    """
+    try:
+        components["classifier_llm"].complete('Reply with {"ok": true}')
+        components["embed_model"].get_query_embedding("warmup")
+    except Exception as exc:
+        context.logger.warning(f"Model warm-up failed (first request will be slower): {exc}")
+
+
 def handler(context, event) -> Response:
     """Route the request to session reset or agent chat."""
 
     # --- Session reset: DELETE /session/{id} ---
     if event.method == "DELETE" and "/session/" in event.path:
         session_id = event.path.split("/session/", 1)[1].strip("/")
-        context.user_data.sessions.pop(session_id, None)
+        ud = context.user_data
+        ud.sessions.pop(session_id, None)
+        ud.turn_locks.pop(session_id, None)
         logger.info("Session cleared: %s", session_id)
-        return Response(body=json.dumps({"status": "ok", "session_id": session_id}))
+        return Response(body=orjson.dumps({"status": "ok", "session_id": session_id}))
+
+    if event.path.rstrip("/").endswith("/agent/batch"):
+        return _handle_batch(context, event)
 
     # --- Agent chat: POST /agent ---
     try:
@@ -93,14 +160,21 @@ def handler(context, event) -> Response:
         query: str = data["query"]
         session_id: str = data.get("session_id", "default")
         job_id: str | None = data.get("job_id")
-    except (KeyError, json.JSONDecodeError, ValueError) as exc:
+        stream = bool(data.get("stream", False))
+    except (KeyError, ValueError) as exc:  # orjson.JSONDecodeError is a ValueError
         return Response(
-            body=json.dumps({"error": f"Bad request: {exc}"}),
+            body=orjson.dumps({"error": f"Bad request: {exc}"}),
             status_code=400,
         )
 
     logger.info("Agent request: session=%s query=%.60s", session_id, query)
 
+    if stream:
+        return Response(
+            content_type="application/x-ndjson",
+            stream=lambda write: _stream_answer(context, query, session_id, job_id, write),
+        )
+
     try:
         answer, intent, routed_via = _classify_and_route(
             context, query, session_id, job_id
@@ -108,11 +182,11 @@ def handler(context, event) -> Response:
     except Exception as exc:
         logger.exception("Agent error: %s", exc)
         return Response(
-            body=json.dumps({"error": str(exc)}),
+            body=orjson.dumps({"error": str(exc)}),
             status_code=502,
         )
 
-    return Response(body=json.dumps({
+    return Response(body=orjson.dumps({
         "answer": answer,
         "session_id": session_id,
         "intent": intent,
@@ -120,8 +194,165 @@ def handler(context, event) -> Response:
     }))
 
 
+def _handle_batch(context, event) -> Response:
+    """Answer several queries as consecutive turns of one session.
+
+    All queries are classified up front (at most BATCH_GROUP_SIZE per LLM
+    call), then each is routed exactly as POST /agent would route it.
+    More than MAX_BATCH_QUERIES queries is a 400.
+    """
+    try:
+        data = event.get_json()
+        queries: list[str] = data["queries"]
+        session_id: str = data.get("session_id", "default")
+        job_id: str | None = data.get("job_id")
+        if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+            raise ValueError("queries must be a list of strings")
+        if len(queries) > MAX_BATCH_QUERIES:
+            raise ValueError(f"at most {MAX_BATCH_QUERIES} queries per batch, got {len(queries)}")
+    except (KeyError, ValueError) as exc:
+        return Response(
+            body=orjson.dumps({"error": f"Bad request: {exc}"}),
+            status_code=400,
+        )
+
+    logger.info("Agent batch request: session=%s queries=%d", session_id, len(queries))
+
+    try:
+        ud = context.user_data
+        classifications = classify_intents_batch(queries, ud.classifier_llm, ud.intent_cache)
+    except Exception as exc:
+        logger.warning("Batch classification failed: %s — routing to agent", exc)
+        classifications = [None] * len(queries)
+
+    results = []
+    try:
+        for query, classification in zip(queries, classifications):
+            answer, intent, routed_via = _route(
+                context, query, session_id, job_id, classification
+            )
+            results.append({"answer": answer, "intent": intent, "routed_via": routed_via})
+    except Exception as exc:
+        logger.exception("Agent error: %s", exc)
+        return Response(
+            body=orjson.dumps({"error": str(exc), "results": results}),
+            status_code=502,
+        )
+
+    return Response(body=orjson.dumps({"session_id": session_id, "results": results}))
+
+
+# ---------------------------------------------------------------------------
+# Internal: streaming
+# ---------------------------------------------------------------------------
+
+def _stream_answer(
+    context,
+    query: str,
+    session_id: str,
+    job_id: str | None,
+    write: Callable[[bytes], None],
+) -> None:
+    """Run _classify_and_route(), writing answer deltas as NDJSON lines.
+
+    Writing never raises: once the client has disconnected, later lines are
+    dropped and the turn runs to completion, so routing fallbacks never see
+    a socket error and the session's turn lock covers the whole turn.
+    """
+    client_gone = False
+
+    def send(line: dict) -> None:
+        nonlocal client_gone
+        if client_gone:
+            return
+        try:
+            write(orjson.dumps(line) + b"\n")
+        except OSError as exc:  # BrokenPipeError / ConnectionResetError
+            client_gone = True
+            logger.info("Stream client disconnected (session %s): %s", session_id, exc)
+
+    def on_delta(delta: str) -> None:
+        if delta:
+            send({"delta": delta})
+
+    try:
+        answer, intent, routed_via = _classify_and_route(
+            context, query, session_id, job_id, on_delta=on_delta
+        )
+    except Exception as exc:
+        logger.exception("Agent error: %s", exc)
+        send({"error": str(exc)})
+        return
+
+    send({
+        "done": True,
+        "answer": answer,
+        "session_id": session_id,
+        "intent": intent,
+        "routed_via": routed_via,
+    })
+
+
+async def _relay_answer_deltas(agent_handler, on_delta: Callable[[str], None]) -> None:
+    """Forward the final-answer part of each ReAct step's streamed output.
+
+    A ReAct step streams "Thought: ... Action: ..." or "Thought: ... Answer: ...";
+    only text after "Answer:" is user-facing, so reasoning is never relayed.
+    """
+    sent = 0      # characters of the current step's answer already relayed
+    step_len = 0  # length of the current step's output, to detect a new step
+    async for event in agent_handler.stream_events():
+        if not isinstance(event, AgentStream):
+            continue
+        text = event.response or ""
+        if len(text) < step_len:  # a new LLM step started
+            sent = 0
+        step_len = len(text)
+        marker = text.find("Answer:")
+        if marker < 0:
+            continue
+        answer = text[marker + len("Answer:"):].lstrip()
+        if len(answer) > sent:
+            on_delta(answer[sent:])
+            sent = len(answer)
+
+
+def _run_on_loop(loop, make_coro, on_delta: Optional[Callable[[str], None]]):
+    """Run make_coro(relay) on the shared loop thread and wait for its result.
+
+    Deltas produced on the loop thread are handed back through a queue and
+    passed to on_delta on the calling (request) thread, so a slow client
+    socket never blocks the loop other requests are using.
+    """
+    if on_delta is None:
+        return asyncio.run_coroutine_threadsafe(make_coro(None), loop).result()
+
+    deltas: queue.SimpleQueue = queue.SimpleQueue()
+    future = asyncio.run_coroutine_threadsafe(make_coro(deltas.put), loop)
+    future.add_done_callback(lambda _: deltas.put(None))
+    try:
+        while (delta := deltas.get()) is not None:
+            on_delta(delta)
+    finally:
+        # If on_delta raised, still wait for the coroutine to finish: the
+        # caller's turn lock must not be released while it runs
+        while delta is not None:
+            delta = deltas.get()
+    return future.result()
+
+
+def _turn_lock(context, session_id: str) -> threading.Lock:
+    ud = context.user_data
+    with ud.turn_locks_guard:
+        return ud.turn_locks.setdefault(session_id, threading.Lock())
+
+
 # ---------------------------------------------------------------------------
 # Internal: intent routing + agent invocation
+#
+# Hot path: context.user_data is read once into a local, and module globals
+# are bound as keyword-only defaults (_classify=classify_intent, ...) so
+# they are fast local loads rather than global lookups on every request.
 # ---------------------------------------------------------------------------
 
 def _classify_and_route(
@@ -129,30 +360,48 @@ def _classify_and_route(
     query: str,
     session_id: str,
     job_id: str | None,
+    on_delta: Optional[Callable[[str], None]] = None,
+    *,
+    _classify=classify_intent,
 ) -> tuple[str, str, str]:
     """Classify intent then route to metadata fast-path or full ReActAgent.
 
+    If on_delta is given, LLM-generated answer text is passed to it as it
+    is produced (metadata answers are not streamed — they are instant).
+    on_delta must not raise: its errors would count as LLM failures.
+
     Returns (answer, intent, routed_via).
     """
-    from router.intent_classifier import classify_intent, handle_metadata_query
-    from agents.career_agent import get_or_create_agent, AGENT_MAX_ITERATIONS
-
-    llm = context.user_data.llm
-    qdrant_reader = context.user_data.qdrant_reader
-    tools = context.user_data.tools
-    sessions = context.user_data.sessions
-
     # --- Step 1: Intent classification (~1-2s LLM call) ---
     try:
-        classification = classify_intent(query, llm)
+        ud = context.user_data
+        classification = _classify(query, ud.classifier_llm, ud.intent_cache)
     except Exception as exc:
         logger.warning("Classification failed: %s — routing to agent", exc)
         classification = None
 
+    return _route(context, query, session_id, job_id, classification, on_delta)
+
+
+def _route(
+    context,
+    query: str,
+    session_id: str,
+    job_id: str | None,
+    classification: Optional[IntentClassification],
+    on_delta: Optional[Callable[[str], None]] = None,
+    *,
+    _handle_metadata=handle_metadata_query,
+    _get_agent=get_or_create_agent,
+) -> tuple[str, str, str]:
+    """Steps 2-5 of _classify_and_route() for an already-classified query."""
+    ud = context.user_data
+    llm = ud.llm
+
     # --- Step 2: Metadata fast-path (deterministic, no ReAct loop) ---
     if classification and classification.requires_metadata:
         try:
-            answer = handle_metadata_query(query, qdrant_reader)
+            answer = _handle_metadata(query, ud.qdrant_reader)
             return answer, classification.intent, "metadata"
         except Exception as exc:
             logger.warning("Metadata handler failed: %s — falling back to agent", exc)
@@ -162,15 +411,18 @@ def _classify_and_route(
     # loops without converging. For greetings / general chat, a direct LLM call
     # is faster and more reliable.
     if classification and classification.intent == "conversational" and not classification.requires_tool:
-        from agents.career_agent import SYSTEM_PROMPT
-        from llama_index.core.llms import ChatMessage, MessageRole
         try:
             messages = [
                 ChatMessage(role=MessageRole.SYSTEM, content=SYSTEM_PROMPT),
                 ChatMessage(role=MessageRole.USER, content=query),
             ]
-            response = llm.chat(messages)
-            answer = response.message.content
+            if on_delta is None:
+                answer = llm.chat(messages).message.content
+            else:
+                answer = ""
+                for chunk in llm.stream_chat(messages):
+                    on_delta(chunk.delta or "")
+                    answer = chunk.message.content
             logger.info("Conversational response via direct LLM (bypassed ReActAgent)")
             return answer, "conversational", "direct_llm"
         except Exception as exc:
@@ -188,20 +440,28 @@ def _classify_and_route(
     # llama-index >=0.14: agent.run() schedules asyncio.Tasks immediately.
     # We use context.user_data.loop (never closed) instead of asyncio.run()
     # (which closes the loop after each call, invalidating subsequent Tasks).
-    loop = context.user_data.loop
+    loop = ud.loop
 
-    agent, memory = get_or_create_agent(sessions, tools, llm, session_id)
+    agent, memory = _get_agent(ud.sessions, ud.tools, llm, session_id)
 
-    async def _invoke():
+    async def _invoke(relay):
         handler = agent.run(
             effective_query,
             memory=memory,
             max_iterations=AGENT_MAX_ITERATIONS,
             early_stopping_method="generate",
         )
+        if relay is not None:
+            await _relay_answer_deltas(handler, relay)
+        else:
+            # The session's agent streams for both paths; discard the events
+            # nobody relays so they do not pile up in the handler's queue
+            async for _ in handler.stream_events():
+                pass
         return await handler
 
-    result = loop.run_until_complete(_invoke())
+    with _turn_lock(context, session_id):
+        result = _run_on_loop(loop, _invoke, on_delta)
     # result is AgentOutput; result.response is a ChatMessage
     answer = result.response.content
 
@@ -2,25 +2,39 @@
 
 Lazily loads one VectorStoreIndex per Qdrant collection (one for the resume,
 one per uploaded job). Re-uses the same Qdrant collections that fn-ingest
-already populates — no double ingestion.
+already populates — no double ingestion. Query engines over those indexes
+are cached here too, shared by every tool, per (collection, top_k, llm);
+query_concurrently() runs a tool's independent retrieval queries in parallel.
 
 The embedding model MUST match the one used by fn-ingest
 (BAAI/bge-small-en-v1.5, 384-dim, cosine, normalised).
+
+Collection contract (set by fn-ingest's _ensure_collection): collections
+carry int8 scalar quantization with always_ram=True. Qdrant applies it to
+every search by default — the int8 copy is scanned and the top hits are
+rescored with the original vectors — so retrievers built here need no
+extra search parameters.
 """
 
 from __future__ import annotations
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from llama_index.core import VectorStoreIndex
+from llama_index.core.base.base_query_engine import BaseQueryEngine
 from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.llms import LLM
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
 
 logger = logging.getLogger(__name__)
 
 RESUME_COLLECTION = "resume_chunks"
+_COLLECTIONS_TTL = 30.0  # seconds a listing of collection names is trusted
+_QUERY_WORKERS = 4  # concurrent retrieval queries across all tool calls
 
 
 class IndexStore:
@@ -30,6 +44,9 @@ class IndexStore:
         self._client = qdrant_client
         self._embed_model = embed_model
         self._cache: dict[str, VectorStoreIndex] = {}
+        self._engines: dict[tuple[str, int, int], BaseQueryEngine] = {}  # (collection, top_k, id(llm))
+        self._pool = ThreadPoolExecutor(max_workers=_QUERY_WORKERS, thread_name_prefix="retrieval")
+        self._collections_cache: tuple[float, set[str]] | None = None
 
     # ------------------------------------------------------------------
     # Private loader
@@ -43,8 +60,7 @@ class IndexStore:
         if collection_name in self._cache:
             return self._cache[collection_name]
 
-        existing = {c.name for c in self._client.get_collections().collections}
-        if collection_name not in existing:
+        if not self._collection_exists(collection_name):
             logger.warning("Collection %s not found in Qdrant", collection_name)
             return None
 
@@ -66,6 +82,21 @@ class IndexStore:
         logger.info("Loaded index for collection %s", collection_name)
         return index
 
+    def _collection_exists(self, collection_name: str) -> bool:
+        """Check existence against a recent listing of collection names.
+
+        Only positive answers are served from the cache: a name missing from
+        a fresh listing triggers a re-list, so a collection fn-ingest created
+        moments ago is never reported absent.
+        """
+        cached = self._collections_cache
+        if cached is not None and time.monotonic() - cached[0] < _COLLECTIONS_TTL:
+            if collection_name in cached[1]:
+                return True
+        names = {c.name for c in self._client.get_collections().collections}
+        self._collections_cache = (time.monotonic(), names)
+        return collection_name in names
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -76,6 +107,54 @@ class IndexStore:
     def job(self, job_id: str) -> Optional[VectorStoreIndex]:
         return self._load(f"job_{job_id}")
 
+    def resume_query_engine(self, llm: LLM, top_k: int) -> Optional[BaseQueryEngine]:
+        return self._query_engine(RESUME_COLLECTION, llm, top_k)
+
+    def job_query_engine(self, job_id: str, llm: LLM, top_k: int) -> Optional[BaseQueryEngine]:
+        return self._query_engine(f"job_{job_id}", llm, top_k)
+
+    def query_concurrently(
+        self, *queries: tuple[Optional[BaseQueryEngine], str],
+    ) -> list[Optional[str]]:
+        """Run (engine, question) pairs in parallel; return each answer as str.
+
+        An entry is None if its engine is None or its query failed (logged),
+        so callers can fall back to raw document text per query.
+        """
+        futures = [
+            self._pool.submit(engine.query, question) if engine is not None else None
+            for engine, question in queries
+        ]
+        answers: list[Optional[str]] = []
+        for future, (_, question) in zip(futures, queries):
+            if future is None:
+                answers.append(None)
+                continue
+            try:
+                answers.append(str(future.result()))
+            except Exception as exc:
+                logger.warning("Retrieval query failed (%.50s): %s", question, exc)
+                answers.append(None)
+        return answers
+
     def invalidate(self, collection_name: str) -> None:
-        """Evict a cached index (e.g. after re-upload)."""
+        """Evict a cached index and its query engines (e.g. after re-upload)."""
         self._cache.pop(collection_name, None)
+        for key in [k for k in self._engines if k[0] == collection_name]:
+            self._engines.pop(key, None)
+        self._collections_cache = None
+
+    def _query_engine(self, collection_name: str, llm: LLM, top_k: int) -> Optional[BaseQueryEngine]:
+        """Build once, then reuse, a query engine over a collection.
+
+        A missing collection is not cached, so the engine is built as soon
+        as the document is uploaded.
+        """
+        key = (collection_name, top_k, id(llm))
+        engine = self._engines.get(key)
+        if engine is None:
+            index = self._load(collection_name)
+            if index is None:
+                return None
+            engine = self._engines[key] = index.as_query_engine(llm=llm, similarity_top_k=top_k)
+        return engine
@@ -6,6 +6,10 @@ Simulates the Nuclio serverless runtime contract:
   - handler(context, event): called per HTTP request
 
 No FastAPI. No uvicorn. Pure Python stdlib http.server.
+Requests are served on concurrent threads (ThreadingHTTPServer), so a
+metadata query is not stuck behind another session's long LLM call;
+function.py guards its shared state accordingly. Connections are kept
+alive (HTTP/1.1) and each response is written in a single send.
 
 To port to real Nuclio: keep function.py unchanged, replace this runner
 with a Nuclio function YAML that references function.py as the handler.
@@ -13,18 +17,24 @@ with a Nuclio function YAML that references function.py as the handler.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
+try:
+    import orjson as _json  # Rust JSON codec; dumps() already returns bytes
+except ImportError:  # the runner stays usable with the stdlib alone
+    import json as _json
+
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
     format="%(asctime)s %(name)s %(levelname)s %(message)s",
 )
 logger = logging.getLogger("nuclio_runner")
 
+from function import handler, init_context  # noqa: E402 — after logging setup
+
 
 # ---------------------------------------------------------------------------
 # Nuclio runtime primitives
@@ -61,7 +71,7 @@ class Event:
         self.method = method
 
     def get_json(self) -> Any:
-        return json.loads(self.body or b"{}")
+        return _json.loads(self.body or b"{}")
 
 
 # ---------------------------------------------------------------------------
@@ -72,6 +82,11 @@ _ctx: Context  # set in __main__ after init_context() runs
 
 
 class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive: the gateway's pooled client reuses connections across
+    # requests. Safe because each connection gets its own thread; idle
+    # ones are dropped after `timeout` seconds (gateway expires at 30 s).
+    protocol_version = "HTTP/1.1"
+    timeout = 60
 
     def do_GET(self) -> None:
         if self.path == "/health":
@@ -90,7 +105,6 @@ class _Handler(BaseHTTPRequestHandler):
         body = self.rfile.read(length) if length else b""
         event = Event(body=body, headers=dict(self.headers), path=self.path, method=method)
         try:
-            from function import handler
             response = handler(_ctx, event)
         except Exception as exc:
             logger.exception("Handler error: %s", exc)
@@ -98,18 +112,46 @@ class _Handler(BaseHTTPRequestHandler):
         self._send(response)
 
     def _send(self, response: Any) -> None:
-        """Send any duck-typed response object with .body/.status_code/.content_type."""
+        """Send any duck-typed response object with .body/.status_code/.content_type.
+
+        A response with a .stream callable is sent incrementally: headers go
+        out first, then stream(write) writes the body piece by piece. Its
+        length is unknown up front, so the body ends when the connection
+        closes (Connection: close) — no chunked framing needed. Every other
+        response carries Content-Length and keeps the connection alive.
+        """
+        stream = getattr(response, "stream", None)
+        if stream is not None:
+            code = getattr(response, "status_code", 200)
+            self.log_request(code)
+            self.close_connection = True
+            self._write_flush(self._head(
+                code, getattr(response, "content_type", "application/json"), b"Connection: close\r\n",
+            ))
+            stream(self._write_flush)
+            return
         self._respond_raw(
             getattr(response, "status_code", 200),
             getattr(response, "body", ""),
             getattr(response, "content_type", "application/json"),
         )
 
-    def _respond_raw(self, code: int, body: str, ct: str = "application/json") -> None:
-        self.send_response(code)
-        self.send_header("Content-Type", ct)
-        self.end_headers()
-        self.wfile.write(body.encode() if isinstance(body, str) else body)
+    def _respond_raw(self, code: int, body: bytes | str, ct: str = "application/json") -> None:
+        """Send status line, headers and body in one write (one syscall)."""
+        if isinstance(body, str):
+            body = body.encode()
+        self.log_request(code)
+        self.wfile.write(self._head(code, ct, b"Content-Length: %d\r\n" % len(body)) + body)
+
+    def _head(self, code: int, ct: str, extra: bytes = b"") -> bytes:
+        reason = self.responses.get(code, ("",))[0]
+        return b"%s %d %s\r\nContent-Type: %s\r\n%s\r\n" % (
+            self.protocol_version.encode(), code, reason.encode(), ct.encode(), extra,
+        )
+
+    def _write_flush(self, data: bytes) -> None:
+        self.wfile.write(data)
+        self.wfile.flush()
 
     def log_message(self, fmt: str, *args: Any) -> None:
         logger.info(fmt, *args)
@@ -117,7 +159,7 @@ class _Handler(BaseHTTPRequestHandler):
 
 class _ErrorResponse:
     def __init__(self, msg: str) -> None:
-        self.body = json.dumps({"error": msg})
+        self.body = _json.dumps({"error": msg})
         self.status_code = 500
         self.content_type = "application/json"
 
@@ -131,10 +173,9 @@ if __name__ == "__main__":
 
     # Initialise context — mimics Nuclio calling init_context() once
     _ctx = Context()
-    from function import init_context
     logger.info("Calling init_context() ...")
     init_context(_ctx)
     logger.info("Function ready on port %d", port)
 
-    server = HTTPServer(("0.0.0.0", port), _Handler)
+    server = ThreadingHTTPServer(("0.0.0.0", port), _Handler)
     server.serve_forever()
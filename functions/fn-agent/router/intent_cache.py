@@ -0,0 +1,126 @@
+"""Semantic cache for intent classification results.
+
+classify_intent() costs a ~1-2s LLM call, yet users repeat the same few
+queries ("hello", "list jobs", "rank all jobs") constantly. This cache
+answers repeats without touching the LLM:
+
+  1. Exact match on the normalised query string — no embedding needed.
+  2. Semantic match: the query is embedded with the already-loaded
+     bge-small model and compared (cosine, vectors are L2-normalised)
+     against recently classified queries. A hit needs similarity >= 0.95.
+
+Both tiers are bounded (MAX_ENTRIES). The exact tier is an LRU; the
+semantic tier is a fixed-size ring buffer, so the oldest embedding is
+overwritten first. On a miss the caller classifies with the LLM and
+calls store().
+
+Thread-safe: fn-agent serves requests on concurrent threads. The lock
+covers only the in-memory structures — embedding runs outside it.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from router.intent_classifier import IntentClassification
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 512
+SIMILARITY_THRESHOLD = 0.95
+EMBEDDING_DIM = 384  # BAAI/bge-small-en-v1.5
+
+
+class IntentCache:
+    """Two-tier (exact, then cosine-similarity) cache of IntentClassification."""
+
+    def __init__(
+        self,
+        embed_model,
+        max_entries: int = MAX_ENTRIES,
+        threshold: float = SIMILARITY_THRESHOLD,
+    ) -> None:
+        self._embed_model = embed_model
+        self._max_entries = max_entries
+        self._threshold = threshold
+
+        self._exact: OrderedDict[str, IntentClassification] = OrderedDict()
+        self._embs = np.zeros((max_entries, EMBEDDING_DIM), dtype=np.float32)
+        self._labels: list[Optional[IntentClassification]] = [None] * max_entries
+        self._size = 0
+        self._next = 0  # ring-buffer write position
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def lookup(self, query: str) -> tuple[Optional[IntentClassification], Optional[np.ndarray]]:
+        """Return (cached classification or None, query embedding or None).
+
+        The embedding is returned on a semantic miss so store() can reuse it
+        instead of embedding the query a second time.
+        """
+        key = _normalise(query)
+        with self._lock:
+            hit = self._exact.get(key)
+            if hit is not None:
+                self._exact.move_to_end(key)
+        if hit is not None:
+            logger.info("Intent cache hit (exact): %.60s", query)
+            return hit, None
+
+        emb = self._embed(query)
+        with self._lock:
+            if not self._size:
+                return None, emb
+            sims = self._embs[: self._size] @ emb
+            best = int(sims.argmax())
+            if sims[best] < self._threshold:
+                return None, emb
+            classification = self._labels[best]
+            self._remember_exact(key, classification)
+        logger.info("Intent cache hit (semantic, sim=%.3f): %.60s", sims[best], query)
+        return classification, emb
+
+    def store(
+        self,
+        query: str,
+        classification: IntentClassification,
+        emb: Optional[np.ndarray] = None,
+    ) -> None:
+        """Cache an LLM classification for future exact and semantic hits."""
+        if emb is None:
+            emb = self._embed(query)
+        with self._lock:
+            self._remember_exact(_normalise(query), classification)
+            self._embs[self._next] = emb
+            self._labels[self._next] = classification
+            self._next = (self._next + 1) % self._max_entries
+            self._size = min(self._size + 1, self._max_entries)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _remember_exact(self, key: str, classification: IntentClassification) -> None:
+        self._exact[key] = classification
+        self._exact.move_to_end(key)
+        if len(self._exact) > self._max_entries:
+            self._exact.popitem(last=False)
+
+    def _embed(self, query: str) -> np.ndarray:
+        emb = np.asarray(self._embed_model.get_query_embedding(query), dtype=np.float32)
+        norm = np.linalg.norm(emb)
+        return emb / norm if norm else emb
+
+
+def _normalise(query: str) -> str:
+    """Case- and whitespace-insensitive key for the exact tier."""
+    return " ".join(query.lower().split())
@@ -14,9 +14,16 @@ Intent types:
   conversational → general career advice or open discussion.
                   Routes to the full ReActAgent with memory.
 
-Classification uses the already-loaded LLM (llama3.1:8b via Ollama).
-The prompt is short and forces JSON output — adds ~1-2 seconds overhead,
+Classification uses the already-loaded model (llama3.1:8b via Ollama)
+through a classifier-specific client: Ollama JSON mode (constrained
+decoding), temperature 0 and a short num_predict cap, so the model
+emits only the JSON object and stops — adds ~1-2 seconds overhead,
 which is recovered on metadata/tool routes that skip the ReAct loop.
+Unambiguous queries ("hello", "thanks", "list jobs", "how many jobs?")
+are matched by an anchored regex prefilter and never reach the LLM;
+repeated and near-duplicate queries skip it via IntentCache
+(router/intent_cache.py). classify_intents_batch() classifies several
+queries per LLM call (numbered [1]..[N] in a single prompt).
 
 Metadata answers (after routing) are produced by handle_metadata_query()
 using Qdrant directly — completely deterministic, no LLM.
@@ -24,12 +31,16 @@ using Qdrant directly — completely deterministic, no LLM.
 
 from __future__ import annotations
 
-import json
 import logging
-from typing import Literal, Optional
+import re
+from typing import TYPE_CHECKING, Literal, Optional
 
+import orjson
 from pydantic import BaseModel, ValidationError
 
+if TYPE_CHECKING:
+    from router.intent_cache import IntentCache
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -64,9 +75,9 @@ class IntentClassification(BaseModel):
 # Classification prompt
 # ---------------------------------------------------------------------------
 
-_CLASSIFICATION_PROMPT = """\
+_ROUTING_RULES = """\
 You are a routing classifier for a career intelligence assistant.
-Classify the user query into EXACTLY ONE of the four intents below.
+Classify each user query into EXACTLY ONE of the four intents below.
 
 INTENT DEFINITIONS:
 - "metadata": user only asks what documents are uploaded — no analysis needed.
@@ -97,18 +108,84 @@ CRITICAL RULES:
 1. "describe/summarise/explain/walk me through my CV/resume" → intent="tool", tool_name="resume_summary"
 2. "which job fits me most/best/more", "best job", "rank jobs", "compare jobs" → intent="tool", tool_name="job_ranking_based_on_fit"
 3. NEVER return a composite like "metadata|retrieval". Return exactly ONE of: metadata, tool, retrieval, conversational.
-4. If unsure between retrieval and tool, prefer "tool".
-
-User query: "{query}"
+4. If unsure between retrieval and tool, prefer "tool"."""
 
-Respond with ONLY valid JSON matching this exact schema, no explanation, no markdown:
-{{
+_CLASSIFICATION_SCHEMA = """\
+{
   "intent": "metadata|tool|retrieval|conversational",
   "requires_retrieval": true_or_false,
   "requires_metadata": true_or_false,
   "requires_tool": true_or_false,
   "tool_name": "one_of_the_tool_names_above_or_null"
-}}"""
+}"""
+
+# Single-query prompt, pre-split around the query: built by concatenation,
+# so no format-string parsing per request (and no brace escaping above).
+_PROMPT_A = _ROUTING_RULES + '\n\nUser query: "'
+_PROMPT_B = (
+    '"\n\nRespond with ONLY valid JSON matching this exact schema, no explanation, no markdown:\n'
+    + _CLASSIFICATION_SCHEMA
+)
+
+# JSON mode constrains output to one JSON object, so the N classifications
+# come back wrapped in {"classifications": [...]} rather than as a bare array.
+_BATCH_INSTRUCTIONS = """
+
+Classify each of the following {n} queries independently:
+{queries}
+
+Respond with ONLY valid JSON, no explanation, no markdown: an object whose
+"classifications" array holds exactly {n} objects, in query order, each
+matching this exact schema:
+"""
+
+# Queries per batched LLM call: rules + queries + answers must all fit the
+# classifier's context window, or Ollama truncates and the JSON breaks
+BATCH_GROUP_SIZE = 8
+
+# ---------------------------------------------------------------------------
+# Deterministic prefilter — whole-query matches only, so anything with
+# extra content ("hi, which job fits me best?") still goes to the LLM
+# ---------------------------------------------------------------------------
+
+_GREETING_RE = re.compile(
+    r"^\s*(hi|hello|hey|good (morning|afternoon|evening)|thanks|thank you|thx|cheers|bye)"
+    r"(\s+(there|again|so much|a lot|very much))?[\s!.,]*$",
+    re.IGNORECASE,
+)
+_JOB_METADATA_RE = re.compile(
+    r"^\s*(please\s+)?("
+    r"(list|show)(\s+me)?(\s+(all|the|my))*(\s+uploaded)?\s+jobs?(\s+descriptions?)?"
+    r"|how many\s+(uploaded\s+)?jobs?(\s+descriptions?)?(\s+(are|have been|did i))?(\s+(there|uploaded))?"
+    r"|(count|number of)(\s+(the|my))?(\s+uploaded)?\s+jobs?(\s+descriptions?)?"
+    r")[\s?!.]*$",
+    re.IGNORECASE,
+)
+
+_CONVERSATIONAL = IntentClassification(
+    intent="conversational",
+    requires_retrieval=False,
+    requires_metadata=False,
+    requires_tool=False,
+    tool_name=None,
+)
+_JOB_METADATA = IntentClassification(
+    intent="metadata",
+    requires_retrieval=False,
+    requires_metadata=True,
+    requires_tool=False,
+    tool_name=None,
+)
+
+
+def _prefilter(query: str) -> Optional[IntentClassification]:
+    """Return a fixed classification for trivially-routable queries, else None."""
+    if _GREETING_RE.match(query):
+        return _CONVERSATIONAL
+    if _JOB_METADATA_RE.match(query):
+        return _JOB_METADATA
+    return None
+
 
 # ---------------------------------------------------------------------------
 # Classifier
@@ -123,7 +200,11 @@ _FALLBACK = IntentClassification(
 )
 
 
-def classify_intent(query: str, llm) -> IntentClassification:
+def classify_intent(
+    query: str,
+    llm,
+    cache: Optional[IntentCache] = None,
+) -> IntentClassification:
     """Classify the user query using the loaded LLM.
 
     Returns a safe fallback (conversational) on any parse error so the
@@ -131,50 +212,186 @@ def classify_intent(query: str, llm) -> IntentClassification:
 
     Args:
         query: The raw user query string.
-        llm:   The already-loaded LlamaIndex LLM (Ollama llama3.1:8b).
+        llm:   The classifier LLM (Ollama llama3.1:8b in JSON mode).
+        cache: Optional IntentCache consulted before, and filled after,
+               the LLM call. Fallback results are never cached.
 
     Returns:
         IntentClassification with intent and routing flags.
     """
-    prompt = _CLASSIFICATION_PROMPT.format(query=query.replace('"', "'"))
+    hit, query_emb = _lookup(query, cache)
+    if hit is not None:
+        return hit
+    return _classify_uncached(query, llm, cache, query_emb)
+
+
+def classify_intents_batch(
+    queries: list[str],
+    llm,
+    cache: Optional[IntentCache] = None,
+) -> list[IntentClassification]:
+    """Classify several queries, sending all cache misses in ONE LLM call.
+
+    Prefilter and cache are applied per query first. Cache misses are sent
+    in groups of up to BATCH_GROUP_SIZE per call. If a group's answer
+    cannot be parsed (bad JSON, wrong length, schema mismatch) each of its
+    queries is classified on its own with classify_intent()'s path.
+
+    Returns:
+        One IntentClassification per query, in input order.
+    """
+    results: list[Optional[IntentClassification]] = [None] * len(queries)
+    pending = []  # (index, query embedding or None)
+    for i, query in enumerate(queries):
+        hit, query_emb = _lookup(query, cache)
+        if hit is not None:
+            results[i] = hit
+        else:
+            pending.append((i, query_emb))
+
+    for start in range(0, len(pending), BATCH_GROUP_SIZE):
+        group = pending[start:start + BATCH_GROUP_SIZE]
+        if len(group) == 1:
+            i, query_emb = group[0]
+            results[i] = _classify_uncached(queries[i], llm, cache, query_emb)
+            continue
+        try:
+            batch = _llm_classify_batch([queries[i] for i, _ in group], llm)
+        except (orjson.JSONDecodeError, ValidationError, Exception) as exc:
+            logger.warning("Batch classification failed (%s) — classifying one by one", exc)
+            batch = None
+        for k, (i, query_emb) in enumerate(group):
+            if batch is None:
+                results[i] = _classify_uncached(queries[i], llm, cache, query_emb)
+            else:
+                results[i] = batch[k]
+                _store(cache, queries[i], batch[k], query_emb)
+    return results
+
+
+def _lookup(query: str, cache: Optional[IntentCache]):
+    """Prefilter, then cache. Returns (classification or None, query embedding or None)."""
+    prefiltered = _prefilter(query)
+    if prefiltered is not None:
+        logger.info("Intent prefiltered: intent=%s (LLM skipped)", prefiltered.intent)
+        return prefiltered, None
+
+    if cache is None:
+        return None, None
     try:
-        response = llm.complete(prompt)
-        text = response.text.strip()
-
-        # Extract first JSON object from the response (model may add preamble)
-        start = text.find("{")
-        end = text.rfind("}") + 1
-        if start < 0 or end <= start:
-            logger.warning("Intent classifier returned no JSON — falling back. Raw: %s", text[:200])
-            return _FALLBACK
-
-        data = json.loads(text[start:end])
-
-        # Validate tool_name is one of the known tools
-        tool_name = data.get("tool_name")
-        if tool_name and tool_name not in VALID_TOOL_NAMES:
-            logger.warning("Unknown tool_name '%s' from classifier — clearing it", tool_name)
-            data["tool_name"] = None
-
-        classification = IntentClassification(**data)
-        logger.info(
-            "Intent classified: intent=%s tool=%s requires_retrieval=%s requires_metadata=%s",
-            classification.intent,
-            classification.tool_name,
-            classification.requires_retrieval,
-            classification.requires_metadata,
-        )
-        return classification
+        return cache.lookup(query)
+    except Exception as exc:
+        logger.warning("Intent cache lookup failed (%s) — classifying with LLM", exc)
+        return None, None
+
 
-    except (json.JSONDecodeError, ValidationError, Exception) as exc:
+def _store(cache: Optional[IntentCache], query: str, classification, query_emb) -> None:
+    if cache is not None and query_emb is not None:
+        cache.store(query, classification, query_emb)
+
+
+def _classify_uncached(query: str, llm, cache: Optional[IntentCache], query_emb) -> IntentClassification:
+    prompt = "".join((_PROMPT_A, query.replace('"', "'"), _PROMPT_B))
+    try:
+        response = llm.complete(prompt)
+        # JSON mode constrains decoding to a single JSON object — no preamble to strip
+        classification = _parse_classification(orjson.loads(response.text))
+    except (orjson.JSONDecodeError, ValidationError, Exception) as exc:
         logger.warning("Intent classification failed (%s) — falling back to conversational", exc)
         return _FALLBACK
+    _store(cache, query, classification, query_emb)
+    return classification
+
+
+def _llm_classify_batch(queries: list[str], llm) -> list[IntentClassification]:
+    """One LLM call for len(queries) >= 2. Raises on any malformed answer."""
+    numbered = "\n".join(
+        f'[{n}] "{query.replace(chr(34), chr(39))}"' for n, query in enumerate(queries, 1)
+    )
+    prompt = "".join((
+        _ROUTING_RULES,
+        _BATCH_INSTRUCTIONS.format(n=len(queries), queries=numbered),
+        _CLASSIFICATION_SCHEMA,
+    ))
+    response = _with_output_budget(llm, len(queries), len(prompt) // 4).complete(prompt)
+    data = orjson.loads(response.text)
+    items = data.get("classifications") if isinstance(data, dict) else data
+    if not isinstance(items, list) or len(items) != len(queries):
+        raise ValueError(f"expected {len(queries)} classifications, got {items!r:.200}")
+    logger.info("Batch-classified %d queries in one LLM call", len(queries))
+    return [_parse_classification(item) for item in items]
+
+
+def _with_output_budget(llm, n: int, prompt_tokens: int):
+    """Return llm with its num_predict cap (sized for one answer) scaled to n answers.
+
+    The cap is clamped to what the context window leaves after the prompt
+    (prompt_tokens, estimated at ~4 chars per token).
+    """
+    kwargs = getattr(llm, "additional_kwargs", None) or {}
+    per_query = kwargs.get("num_predict")
+    if not per_query:
+        return llm
+    budget = per_query * n
+    context_window = getattr(llm, "context_window", None)
+    if context_window:
+        budget = max(per_query, min(budget, context_window - prompt_tokens))
+    return llm.model_copy(update={"additional_kwargs": {**kwargs, "num_predict": budget}})
+
+
+_INTENTS = frozenset(("metadata", "tool", "retrieval", "conversational"))
+_FLAGS = ("requires_retrieval", "requires_metadata", "requires_tool")
+
+
+def _is_well_formed(data: dict) -> bool:
+    """True if data needs no coercion: valid intent, real bools, str-or-null tool_name."""
+    tool_name = data.get("tool_name")
+    return (
+        data.get("intent") in _INTENTS
+        and all(data.get(flag).__class__ is bool for flag in _FLAGS)
+        and (tool_name is None or tool_name.__class__ is str)
+    )
+
+
+def _parse_classification(data: dict) -> IntentClassification:
+    # Validate tool_name is one of the known tools
+    tool_name = data.get("tool_name")
+    if tool_name and tool_name not in VALID_TOOL_NAMES:
+        logger.warning("Unknown tool_name '%s' from classifier — clearing it", tool_name)
+        data["tool_name"] = None
+
+    if _is_well_formed(data):
+        # Already exactly the schema — skip Pydantic validation
+        classification = IntentClassification.model_construct(
+            intent=data["intent"],
+            requires_retrieval=data["requires_retrieval"],
+            requires_metadata=data["requires_metadata"],
+            requires_tool=data["requires_tool"],
+            tool_name=data.get("tool_name"),
+        )
+    else:
+        classification = IntentClassification(**data)  # coerces, or raises ValidationError
+    logger.info(
+        "Intent classified: intent=%s tool=%s requires_retrieval=%s requires_metadata=%s",
+        classification.intent,
+        classification.tool_name,
+        classification.requires_retrieval,
+        classification.requires_metadata,
+    )
+    return classification
 
 
 # ---------------------------------------------------------------------------
 # Metadata answer generator (deterministic — no LLM)
 # ---------------------------------------------------------------------------
 
+# One C-level scan per branch instead of repeated lower() + substring loops
+_JOB_LIST_RE = re.compile(r"\b(list job|show job|what job|which job|uploaded job)", re.IGNORECASE)
+_COUNT_RE = re.compile(r"\b(how many|count|number of)", re.IGNORECASE)
+_RESUME_RE = re.compile(r"resume", re.IGNORECASE)
+_RESUME_STATUS_RE = re.compile(r"\b(which|active|current|uploaded)", re.IGNORECASE)
+
+
 def handle_metadata_query(query: str, qdrant_reader) -> str:
     """Answer metadata queries directly from Qdrant — zero LLM involvement.
 
@@ -190,21 +407,21 @@ def handle_metadata_query(query: str, qdrant_reader) -> str:
     """
     job_ids = qdrant_reader.list_job_ids()
     resume_exists = qdrant_reader.collection_exists("resume_chunks")
-    query_lower = query.lower()
 
     # --- Job listing / count queries ---
-    if any(kw in query_lower for kw in ("list job", "show job", "what job", "which job", "uploaded job")):
+    if _JOB_LIST_RE.search(query):
         if not job_ids:
             return "No job descriptions have been uploaded yet."
+        titles = qdrant_reader.get_first_lines(job_ids)
         lines = []
         for jid in job_ids:
-            title = qdrant_reader.get_first_line(f"job_{jid}") or f"Job {jid}"
+            title = titles[jid] or f"Job {jid}"
             lines.append(f"• **{title}** (id: `{jid}`)")
         header = f"**{len(job_ids)} job description(s) uploaded:**"
         return header + "\n" + "\n".join(lines)
 
     # --- Count queries ---
-    if any(kw in query_lower for kw in ("how many", "count", "number of")):
+    if _COUNT_RE.search(query):
         parts = []
         parts.append(f"**{len(job_ids)}** job description(s) uploaded")
         if resume_exists:
@@ -214,7 +431,7 @@ def handle_metadata_query(query: str, qdrant_reader) -> str:
         return "\n".join(f"• {p}" for p in parts)
 
     # --- Resume status queries ---
-    if "resume" in query_lower and any(kw in query_lower for kw in ("which", "active", "current", "uploaded")):
+    if _RESUME_RE.search(query) and _RESUME_STATUS_RE.search(query):
         if resume_exists:
             return "A resume is currently uploaded and active."
         return "No resume has been uploaded yet. Please upload a resume to begin analysis."
@@ -224,7 +441,8 @@ def handle_metadata_query(query: str, qdrant_reader) -> str:
     lines.append(f"• Resume: {'uploaded (active)' if resume_exists else 'not uploaded'}")
     lines.append(f"• Job descriptions: **{len(job_ids)}**")
     if job_ids:
+        titles = qdrant_reader.get_first_lines(job_ids)
         for jid in job_ids:
-            title = qdrant_reader.get_first_line(f"job_{jid}") or f"Job {jid}"
+            title = titles[jid] or f"Job {jid}"
             lines.append(f"  — {title} (id: `{jid}`)")
     return "\n".join(lines)
@@ -2,10 +2,106 @@
 
 Computes skill coverage: what fraction of the job's required skills
 the candidate's resume covers. No LLM involved.
+
+Skills must be the canonical strings extract_skills() returns; nothing is
+re-normalised per call. Set arithmetic runs on int bitmasks over the
+extractor's vocabulary.
 """
 
 from __future__ import annotations
 
+import threading
+from functools import lru_cache
+from typing import Iterable
+
+from services.skill_extractor import SKILL_VOCABULARY
+
+# Canonical skill → bit position; unknown skills are appended after the vocabulary
+_SKILL_NAMES: list[str] = list(SKILL_VOCABULARY)
+_SKILL_IDS: dict[str, int] = {s: i for i, s in enumerate(_SKILL_NAMES)}
+_EXTRA_LOCK = threading.Lock()  # tools run on concurrent threads; one bit per unknown skill
+_SORTED_BITS = len(_SKILL_NAMES)  # masks below 1 << _SORTED_BITS decode in order
+_VOCAB_MASK = (1 << _SORTED_BITS) - 1
+_VOCAB_BYTES = (_SORTED_BITS + 7) // 8
+
+# _BYTE_SKILLS[i][b]: the vocabulary skills set in byte value b at byte i of a mask
+_BYTE_SKILLS: list[list[tuple[str, ...]]] = [
+    [
+        tuple(_SKILL_NAMES[i * 8 + bit] for bit in range(8) if b >> bit & 1 and i * 8 + bit < _SORTED_BITS)
+        for b in range(256)
+    ]
+    for i in range(_VOCAB_BYTES)
+]
+
+
+def skill_mask(skills: Iterable[str]) -> int:
+    """Encode a skill set as an int bitmask over the shared vocabulary."""
+    if isinstance(skills, frozenset):
+        return _frozen_mask(skills)
+    return _encode(skills)
+
+
+@lru_cache(maxsize=128)
+def _frozen_mask(skills: frozenset[str]) -> int:
+    return _encode(skills)
+
+
+def _encode(skills: Iterable[str]) -> int:
+    mask = 0
+    for skill in skills:
+        bit = _SKILL_IDS.get(skill)
+        if bit is None:
+            bit = _extra_bit(skill)
+        mask |= 1 << bit
+    return mask
+
+
+def _extra_bit(skill: str) -> int:
+    """Assign (once) the next free bit to a skill outside the vocabulary."""
+    with _EXTRA_LOCK:
+        bit = _SKILL_IDS.get(skill)  # another thread may have added it meanwhile
+        if bit is None:
+            _SKILL_NAMES.append(skill)  # before the id is published, for _decode
+            bit = _SKILL_IDS[skill] = len(_SKILL_NAMES) - 1
+    return bit
+
+
+def _decode(mask: int) -> list[str]:
+    """Return the skills in *mask*, alphabetically sorted."""
+    skills: list[str] = []
+    for row, b in zip(_BYTE_SKILLS, (mask & _VOCAB_MASK).to_bytes(_VOCAB_BYTES, "little")):
+        if b:
+            skills += row[b]
+    extra = mask >> _SORTED_BITS
+    if not extra:
+        return skills
+    # Skills appended after the vocabulary: bit by bit, then merged
+    while extra:
+        low = extra & -extra
+        skills.append(_SKILL_NAMES[_SORTED_BITS + low.bit_length() - 1])
+        extra ^= low
+    return sorted(skills)
+
+
+def rank_fit(
+    resume_skills: set[str],
+    jobs_skills: list[set[str]],
+) -> list[tuple[float, list[str], list[str]]]:
+    """Batch coverage_score() + skill_gap() for ranking: (score, matched, missing) per job.
+
+    Matched and missing lists come straight from the AND / AND-NOT masks,
+    so no intermediate sets are built and no per-job sort is needed.
+    """
+    resume = skill_mask(resume_skills)
+    results = []
+    for job_skills in jobs_skills:
+        job = skill_mask(job_skills)
+        matched = resume & job
+        total = job.bit_count()
+        score = round(matched.bit_count() / total, 4) if total else 0.0
+        results.append((score, _decode(matched), _decode(job & ~resume)))
+    return results
+
 
 def coverage_score(resume_skills: set[str], job_skills: set[str]) -> float:
     """Return |resume ∩ job| / |job|.
@@ -13,10 +109,10 @@ def coverage_score(resume_skills: set[str], job_skills: set[str]) -> float:
     A score of 1.0 means the resume covers every skill the job asks for.
     Returns 0.0 if job_skills is empty.
     """
-    if not job_skills:
+    job = skill_mask(job_skills)
+    if not job:
         return 0.0
-    matched = resume_skills & job_skills
-    return round(len(matched) / len(job_skills), 4)
+    return round((skill_mask(resume_skills) & job).bit_count() / job.bit_count(), 4)
 
 
 def skill_gap(resume_skills: set[str], job_skills: set[str]) -> tuple[list[str], list[str], list[str]]:
@@ -26,7 +122,6 @@ def skill_gap(resume_skills: set[str], job_skills: set[str]) -> tuple[list[str],
     - missing: job skills absent from resume (gaps)
     - bonus:   resume skills not required by the job (extras)
     """
-    matched = sorted(resume_skills & job_skills)
-    missing = sorted(job_skills - resume_skills)
-    bonus = sorted(resume_skills - job_skills)
-    return matched, missing, bonus
+    resume = skill_mask(resume_skills)
+    job = skill_mask(job_skills)
+    return _decode(resume & job), _decode(job & ~resume), _decode(resume & ~job)
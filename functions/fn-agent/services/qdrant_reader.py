@@ -2,97 +2,456 @@
 
 Scrolls all chunks from a Qdrant collection and returns them sorted
 by chunk_index so the reconstructed text is in the original document order.
+
+Texts, skill sets and job titles are cached per collection and revalidated
+with a cheap version probe (point count + the ingest_id fn-ingest stamps on
+every point). Skill sets are also persisted in the "skills_index"
+collection, so a restarted process does not rescan every document.
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
-from typing import Optional
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Iterator, Optional
 
+import grpc
 from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PayloadSchemaType,
+    PointStruct,
+    VectorParams,
+)
+
+from services.skill_extractor import VOCABULARY_ID, extract_chunk_skills, extract_skills
 
 logger = logging.getLogger(__name__)
 
-_SCROLL_BATCH = 100
+_SCROLL_BATCH = 1024  # a whole document in one round-trip (~800-token chunks)
+_FANOUT_WORKERS = 8  # concurrent per-collection requests (also caps load on Qdrant)
+_NAMES_TTL = 2.0  # seconds a collection-name listing (or version probe) is reused
+_TITLE_TTL = 300.0  # seconds a job's first line is reused
+_FIRST_CHUNK = Filter(must=[FieldCondition(key="chunk_index", match=MatchValue(value=0))])
+_BY_INDEX = itemgetter(0)  # sort key for (chunk_index, text) pairs
+SKILLS_INDEX = "skills_index"  # one payload-only point per document: persisted skill sets
 
 
 class QdrantReader:
     def __init__(self, client: QdrantClient) -> None:
         self._client = client
+        self._pool = ThreadPoolExecutor(max_workers=_FANOUT_WORKERS, thread_name_prefix="qdrant")
+        self._texts: dict[str, tuple[tuple, str]] = {}  # collection → (version, full text)
+        self._skills: dict[str, tuple[tuple, frozenset[str]]] = {}  # collection → (version, skills)
+        self._names: tuple[float, frozenset[str]] = (float("-inf"), frozenset())
+        self._index_lock = threading.Lock()  # serialises creating SKILLS_INDEX
+        self._indexed: set[str] = set()  # collections known to have a chunk_index index
+        self._versions: dict[str, tuple[float, Optional[tuple]]] = {}  # collection → (probed at, version)
+        self._titles: dict[str, tuple[float, str]] = {}  # job collection → (read at, first line)
 
     # ------------------------------------------------------------------
     # Public helpers
     # ------------------------------------------------------------------
 
     def collection_exists(self, collection_name: str) -> bool:
-        names = {c.name for c in self._client.get_collections().collections}
-        return collection_name in names
+        return collection_name in self._collection_names()
 
     def list_job_ids(self) -> list[str]:
         """Return all job_ids by scanning collections named job_<id>."""
-        names = {c.name for c in self._client.get_collections().collections}
-        return [n[4:] for n in names if n.startswith("job_")]
+        return [n[4:] for n in self._collection_names() if n.startswith("job_")]
 
     def get_full_text(self, collection_name: str) -> Optional[str]:
         """Return ordered, concatenated text from all chunks in a collection.
 
         Returns None if the collection does not exist or is empty.
+        The same str object is returned while the collection is unchanged,
+        so callers can memoise work derived from it (see extract_skills).
         """
-        if not self.collection_exists(collection_name):
+        version = self._version(collection_name)
+        if version is None:
+            self._texts.pop(collection_name, None)
+            logger.warning("Collection %s does not exist", collection_name)
+            return None
+
+        cached = self._texts.get(collection_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        full_text = self._scroll_text(collection_name)
+        if full_text is not None:
+            self._texts[collection_name] = (version, full_text)
+        return full_text
+
+    def get_full_texts(self, job_ids: list[str]) -> dict[str, Optional[str]]:
+        """Return {job_id: get_full_text(job_<id>)}, fetching the jobs concurrently."""
+        names = [f"job_{jid}" for jid in job_ids]
+        return dict(zip(job_ids, self._pool.map(self.get_full_text, names)))
+
+    def get_text_prefix(self, collection_name: str, max_chars: int) -> Optional[str]:
+        """Return get_full_text(collection_name)[:max_chars], reading only leading chunks.
+
+        Chunks are fetched by chunk_index (0, 1, ...) until max_chars is
+        covered, which for prompt-sized prefixes is usually chunk 0 alone.
+        A cached full text is sliced instead; a collection without
+        chunk_index payloads falls back to the full read.
+        """
+        version = self._version(collection_name)
+        if version is None:
             logger.warning("Collection %s does not exist", collection_name)
             return None
 
-        chunks: list[tuple[int, str]] = []
+        cached = self._texts.get(collection_name)
+        if cached is not None and cached[0] == version:
+            return cached[1][:max_chars]
+
+        parts: list[str] = []
+        length = 0
+        idx = 0
+        total = None
+        while length < max_chars and (total is None or idx < total):
+            result, _ = self._client.scroll(
+                collection_name=collection_name,
+                scroll_filter=Filter(must=[FieldCondition(key="chunk_index", match=MatchValue(value=idx))]),
+                limit=1,
+                with_payload=["text", "total_chunks"],
+                with_vectors=False,
+            )
+            if not result:
+                break
+            payload = result[0].payload or {}
+            text = payload.get("text", "")
+            if text:
+                parts.append(text)
+                length += len(text) + 2  # + the "\n\n" separator
+            total = payload.get("total_chunks")
+            if not isinstance(total, int):
+                total = None
+            idx += 1
+
+        if not parts:
+            full_text = self.get_full_text(collection_name)
+            return full_text[:max_chars] if full_text else None
+        return "\n\n".join(parts)[:max_chars]
+
+    def get_skills(self, collection_name: str) -> Optional[frozenset[str]]:
+        """Return extract_skills() of the collection's text without joining it.
+
+        Returns None if the collection does not exist or is empty. The same
+        frozenset is returned while the collection is unchanged.
+        """
+        version = self._version(collection_name)
+        if version is None:
+            self._skills.pop(collection_name, None)
+            logger.warning("Collection %s does not exist", collection_name)
+            return None
+
+        cached_text = self._texts.get(collection_name)
+        if cached_text is not None and cached_text[0] == version:
+            return extract_skills(cached_text[1])
+        cached = self._skills.get(collection_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        skills = self._load_skills(collection_name, version)
+        if skills is not None:
+            self._skills[collection_name] = (version, skills)
+            return skills
+
+        chunks = 0
+
+        def counted() -> Iterator[str]:
+            nonlocal chunks
+            for text in self.iter_chunks(collection_name):
+                chunks += 1
+                yield text
+
+        skills = extract_chunk_skills(counted())
+        if not chunks:
+            return None
+        logger.info("Scanned %d chunks from %s (%d skills)", chunks, collection_name, len(skills))
+        self._skills[collection_name] = (version, skills)
+        self._store_skills(collection_name, version, skills)
+        return skills
+
+    def get_skills_many(self, job_ids: list[str]) -> dict[str, Optional[frozenset[str]]]:
+        """Return {job_id: get_skills(job_<id>)}, fetching the jobs concurrently."""
+        names = [f"job_{jid}" for jid in job_ids]
+        return dict(zip(job_ids, self._pool.map(self.get_skills, names)))
+
+    def iter_chunks(self, collection_name: str) -> Iterator[str]:
+        """Yield each non-empty chunk text in scroll order (not chunk_index order).
+
+        Nothing is accumulated: each page of points is released once its
+        texts have been consumed.
+        """
+        offset = None
+        while True:
+            result, offset = self._client.scroll(
+                collection_name=collection_name,
+                limit=_SCROLL_BATCH,
+                with_payload=["text"],
+                with_vectors=False,
+                offset=offset,
+            )
+            for point in result:
+                text = (point.payload or {}).get("text", "")
+                if text:
+                    yield text
+            if offset is None:
+                return
+
+    def _version(self, collection_name: str) -> Optional[tuple]:
+        """Return a value that changes whenever the collection is re-ingested, or None if absent."""
+        probed = self._versions.get(collection_name)
+        if probed is not None and time.monotonic() - probed[0] < _NAMES_TTL:
+            return probed[1]
+        version = self._probe_version(collection_name)
+        self._versions[collection_name] = (time.monotonic(), version)
+        return version
+
+    def _probe_version(self, collection_name: str) -> Optional[tuple]:
+        try:
+            info = self._client.get_collection(collection_name)
+        except (UnexpectedResponse, grpc.RpcError) as exc:
+            if _is_not_found(exc):
+                return None
+            raise
+        if collection_name not in self._indexed:
+            self._ensure_chunk_index(collection_name, info)
+        first, _ = self._client.scroll(
+            collection_name=collection_name, limit=1, with_payload=["ingest_id"], with_vectors=False,
+        )
+        if not first:
+            return info.points_count, None
+        return info.points_count, (first[0].payload or {}).get("ingest_id") or first[0].id
+
+    def _ensure_chunk_index(self, collection_name: str, info) -> None:
+        """Index chunk_index on collections ingested before fn-ingest created it."""
+        self._indexed.add(collection_name)  # one attempt per process
+        if "chunk_index" in (info.payload_schema or {}):
+            return
+        try:
+            self._client.create_payload_index(
+                collection_name=collection_name,
+                field_name="chunk_index",
+                field_schema=PayloadSchemaType.INTEGER,
+                wait=False,
+            )
+            logger.info("Created chunk_index payload index on %s", collection_name)
+        except Exception as exc:
+            logger.warning("Could not index chunk_index on %s: %s", collection_name, exc)
+
+    def _scroll_text(self, collection_name: str) -> Optional[str]:
+        """Scroll every chunk and join them in chunk_index order.
+
+        fn-ingest stores chunk_index and total_chunks on every point, so each
+        text is dropped straight into its slot; only points missing those
+        fields (older ingests) fall back to a sort. Qdrant 1.7 has no
+        server-side order_by for scroll.
+        """
+        slots: list[Optional[str]] = []
+        unplaced: list[tuple[int, str]] = []
         offset = None
 
         while True:
             result, next_offset = self._client.scroll(
                 collection_name=collection_name,
                 limit=_SCROLL_BATCH,
-                with_payload=True,
+                with_payload=["text", "chunk_index", "total_chunks"],
+                with_vectors=False,
                 offset=offset,
             )
             for point in result:
                 payload = point.payload or {}
                 text = payload.get("text", "")
+                if not text:
+                    continue
                 idx = payload.get("chunk_index", 0)
-                if text:
-                    chunks.append((idx, text))
+                total = payload.get("total_chunks")
+                if isinstance(total, int) and len(slots) < total:
+                    slots.extend([None] * (total - len(slots)))
+                if isinstance(idx, int) and 0 <= idx < len(slots) and slots[idx] is None:
+                    slots[idx] = text
+                else:
+                    unplaced.append((idx, text))
 
             if next_offset is None:
                 break
             offset = next_offset
 
-        if not chunks:
+        if unplaced:
+            # Slots are already in order: sort only the unplaced points and
+            # merge (ties keep slotted chunks first, as a stable sort would)
+            placed = ((i, t) for i, t in enumerate(slots) if t is not None)
+            unplaced.sort(key=_BY_INDEX)
+            texts = [t for _, t in heapq.merge(placed, unplaced, key=_BY_INDEX)]
+        else:
+            texts = [t for t in slots if t is not None]
+
+        if not texts:
             return None
 
-        chunks.sort(key=lambda x: x[0])
-        full_text = "\n\n".join(t for _, t in chunks)
-        logger.info("Read %d chunks from %s (%d chars)", len(chunks), collection_name, len(full_text))
+        full_text = "\n\n".join(texts)
+        logger.info("Read %d chunks from %s (%d chars)", len(texts), collection_name, len(full_text))
         return full_text
 
     def get_first_line(self, collection_name: str) -> str:
-        """Return the first non-empty line of the chunk with chunk_index=0.
-
-        Scroll may return points in any order, so we fetch up to 20 and pick
-        the one with the lowest chunk_index rather than trusting the first hit.
-        """
+        """Return the first non-empty line of the chunk with chunk_index=0."""
         if not self.collection_exists(collection_name):
             return ""
+        return self._read_first_line(collection_name)
+
+    def get_first_lines(self, job_ids: list[str]) -> dict[str, str]:
+        """Return {job_id: first line} for jobs known to exist (e.g. from list_job_ids()).
+
+        Each job lives in its own collection, so the scrolls cannot be merged
+        into one request; they are issued concurrently instead, making the
+        cost one round-trip rather than one per job.
+        """
+        names = [f"job_{jid}" for jid in job_ids]
+        return dict(zip(job_ids, self._pool.map(self._job_title, names)))
+
+    def get_titles_and_skills(
+        self, job_ids: list[str],
+    ) -> tuple[dict[str, str], dict[str, Optional[frozenset[str]]]]:
+        """get_first_lines() and get_skills_many() in one concurrent wave.
+
+        All 2 × N per-job requests are queued on the pool together, so the
+        title scrolls overlap the skill lookups instead of waiting for them.
+        """
+        names = [f"job_{jid}" for jid in job_ids]
+        title_futures = [self._pool.submit(self._job_title, n) for n in names]
+        skill_futures = [self._pool.submit(self.get_skills, n) for n in names]
+        return (
+            {jid: f.result() for jid, f in zip(job_ids, title_futures)},
+            {jid: f.result() for jid, f in zip(job_ids, skill_futures)},
+        )
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _collection_names(self) -> frozenset[str]:
+        fetched_at, names = self._names
+        if time.monotonic() - fetched_at >= _NAMES_TTL:
+            names = frozenset(c.name for c in self._client.get_collections().collections)
+            self._names = (time.monotonic(), names)
+        return names
+
+    def _load_skills(self, collection_name: str, version: tuple) -> Optional[frozenset[str]]:
+        """Return the persisted skill set if it matches *version* and the vocabulary."""
+        try:
+            points = self._client.retrieve(
+                collection_name=SKILLS_INDEX,
+                ids=[_skills_point_id(collection_name)],
+                with_payload=True,
+                with_vectors=False,
+            )
+        except (UnexpectedResponse, grpc.RpcError) as exc:
+            if _is_not_found(exc):  # index not created yet
+                return None
+            raise
+        if not points:
+            return None
+        payload = points[0].payload or {}
+        if payload.get("version") != list(version) or payload.get("vocabulary") != VOCABULARY_ID:
+            return None
+        # Same vocabulary, so interning yields extract_skills()' canonical objects
+        return frozenset(sys.intern(s) for s in payload.get("skills", []))
+
+    def _store_skills(self, collection_name: str, version: tuple, skills: frozenset[str]) -> None:
+        """Persist *skills* for later processes; failures only cost a rescan."""
+        try:
+            self._ensure_skills_index()
+            self._client.upsert(
+                collection_name=SKILLS_INDEX,
+                points=[PointStruct(
+                    id=_skills_point_id(collection_name),
+                    vector=[0.0],
+                    payload={
+                        "collection": collection_name,
+                        "version": list(version),
+                        "vocabulary": VOCABULARY_ID,
+                        "skills": sorted(skills),
+                    },
+                )],
+            )
+        except Exception as exc:
+            logger.warning("Could not persist skills for %s: %s", collection_name, exc)
+
+    def _ensure_skills_index(self) -> None:
+        with self._index_lock:
+            if SKILLS_INDEX in self._collection_names():
+                return
+            if SKILLS_INDEX not in {c.name for c in self._client.get_collections().collections}:
+                # Payload store only: a 1-d placeholder vector (never searched)
+                self._client.create_collection(
+                    collection_name=SKILLS_INDEX,
+                    vectors_config=VectorParams(size=1, distance=Distance.DOT),
+                )
+            self._names = (float("-inf"), frozenset())  # re-list on next use
+
+    def _job_title(self, collection_name: str) -> str:
+        """_read_first_line() for a job collection, cached for _TITLE_TTL."""
+        cached = self._titles.get(collection_name)
+        if cached is not None and time.monotonic() - cached[0] < _TITLE_TTL:
+            return cached[1]
+        title = self._read_first_line(collection_name)
+        if title:  # an empty read may be a collection still being written
+            self._titles[collection_name] = (time.monotonic(), title)
+        return title
+
+    def _read_first_line(self, collection_name: str) -> str:
+        # Fetch just the first chunk (chunk_index is payload-indexed by fn-ingest)
         result, _ = self._client.scroll(
             collection_name=collection_name,
-            limit=20,
-            with_payload=True,
+            scroll_filter=_FIRST_CHUNK,
+            limit=1,
+            with_payload=["text"],
+            with_vectors=False,
         )
         if not result:
-            return ""
-        # Sort by chunk_index; fall back to 0 if the field is absent
-        points = sorted(result, key=lambda p: (p.payload or {}).get("chunk_index", 0))
-        text = (points[0].payload or {}).get("text", "")
-        # Collapse PDF whitespace artefacts before scanning lines
-        text = " ".join(text.split())
-        for line in text.split("."):
-            line = line.strip()
-            if line and len(line) > 5:
+            # Points without a chunk_index: scroll may return them in any
+            # order, so take the lowest-indexed of the first 20
+            result, _ = self._client.scroll(
+                collection_name=collection_name,
+                limit=20,
+                with_payload=True,
+                with_vectors=False,
+            )
+            if not result:
+                return ""
+            result = sorted(result, key=lambda p: (p.payload or {}).get("chunk_index", 0))
+        text = (result[0].payload or {}).get("text", "")
+        # First sentence longer than 5 chars; stops at the first hit. PDF
+        # whitespace artefacts are collapsed in that sentence only.
+        start = 0
+        while True:
+            end = text.find(".", start)
+            line = " ".join((text[start:end] if end >= 0 else text[start:]).split())
+            if len(line) > 5:
                 return line[:120]
-        return ""
+            if end < 0:
+                return ""
+            start = end + 1
+
+
+def _is_not_found(exc: Exception) -> bool:
+    """True for a missing collection over either transport (REST 404 / gRPC NOT_FOUND)."""
+    if isinstance(exc, UnexpectedResponse):
+        return exc.status_code == 404
+    return isinstance(exc, grpc.RpcError) and exc.code() == grpc.StatusCode.NOT_FOUND
+
+
+def _skills_point_id(collection_name: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"skills_index/{collection_name}"))
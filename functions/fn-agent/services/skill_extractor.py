@@ -1,12 +1,21 @@
 """Deterministic keyword-based skill extractor.
 
 No LLM involved — uses regex word-boundary matching against a curated
-skill vocabulary. Returns a lowercase normalised set of detected skills.
+skill vocabulary. Returns a lowercase normalised set of detected skills,
+with alternative spellings ("k8s", "sklearn") folded onto one canonical
+skill; the returned strings are the vocabulary's interned objects.
+
+extract_skills() scans a whole text and is memoised per text;
+extract_chunk_skills() scans a document chunk by chunk.
 """
 
 from __future__ import annotations
 
+import hashlib
 import re
+import sys
+from functools import lru_cache
+from typing import Iterable
 
 # ---------------------------------------------------------------------------
 # Curated skill vocabulary
@@ -73,30 +82,114 @@ _SKILLS: list[str] = [
     "technical planning", "system design",
 ]
 
-# Pre-compile patterns: multi-word first so longer matches win
-_MULTI_WORD = [(s, re.compile(r'\b' + re.escape(s) + r'\b', re.IGNORECASE))
-               for s in _SKILLS if ' ' in s or '-' in s or '/' in s]
-_SINGLE_WORD = [(s, re.compile(r'\b' + re.escape(s) + r'\b', re.IGNORECASE))
-                for s in _SKILLS if ' ' not in s and '-' not in s and '/' not in s]
 
+# Alternative spellings of one skill → the name it is reported under. Both
+# are still matched in text, so a resume saying "k8s" covers a job asking
+# for "kubernetes" instead of listing the same skill as matched AND missing.
+_ALIASES: dict[str, str] = {
+    "golang": "go",
+    "sklearn": "scikit-learn",
+    "hugging face": "huggingface",
+    "large language model": "llm",
+    "retrieval augmented generation": "rag",
+    "llama index": "llamaindex",
+    "weights and biases": "wandb",
+    "k8s": "kubernetes",
+    "google cloud": "gcp",
+}
+
+
+def _canonical(skill: str) -> str:
+    return sys.intern(skill.strip().lower())
+
+
+# Every spelling the regex matches, sorted
+_SPELLINGS: tuple[str, ...] = tuple(sorted({_canonical(s) for s in _SKILLS}))
+
+# matched text (lowercased) → canonical skill
+_BY_LOWER: dict[str, str] = {s: _canonical(_ALIASES.get(s, s)) for s in _SPELLINGS}
+
+# Every skill extract_skills() can return, sorted — fit_scorer's bit order
+SKILL_VOCABULARY: tuple[str, ...] = tuple(sorted(set(_BY_LOWER.values())))
+
+
+def _trie_pattern(skills) -> str:
+    """Regex matching any of *skills*, factored into a prefix trie.
+
+    A skill that is a prefix of another becomes an optional (greedy) tail,
+    so the longest skill at a position is tried first.
+    """
+    trie: dict = {}
+    for skill in skills:
+        node = trie
+        for ch in skill:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-skill marker
+
+    def emit(node: dict) -> str:
+        # A space inside a phrase matches any whitespace run, so PDF artefacts
+        # like "machine\n \nlearning" match without normalising the text first
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + emit(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
 
-def extract_skills(text: str) -> set[str]:
+    return emit(trie)
+
+
+# Word boundaries are lookarounds, not \b: \b after "c++" or "c#" needs a
+# following word character, so those skills could never match before a space.
+_SKILLS_RE = re.compile(r"(?<!\w)(?=(" + _trie_pattern(_SPELLINGS) + r")(?!\w))", re.IGNORECASE)
+
+# Changes whenever the vocabulary, the aliases or the matching rules do;
+# stored alongside persisted skill sets so older extractions are not reused
+VOCABULARY_ID: str = hashlib.sha1(
+    (_SKILLS_RE.pattern + repr(sorted(_ALIASES.items()))).encode()
+).hexdigest()[:12]
+
+
+# Must exceed resume + job count: ranking visits every document in turn,
+# and a cyclic scan over more entries than the LRU holds never hits.
+_EXTRACT_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=_EXTRACT_CACHE_SIZE)
+def extract_skills(text: str) -> frozenset[str]:
     """Return a set of lowercase normalised skill strings found in *text*."""
     found: set[str] = set()
+    _scan(text, found)
+    return frozenset(found)
+
+
+def extract_chunk_skills(chunks: Iterable[str]) -> frozenset[str]:
+    """Return the union of the skills found in each chunk (not memoised).
+
+    Chunks are scanned as they arrive, so a streamed document is never
+    held in memory whole. A phrase split across two chunks is not matched;
+    fn-ingest chunks on sentence boundaries with overlap, so that case
+    does not arise for ingested documents.
+    """
+    found: set[str] = set()
+    for chunk in chunks:
+        _scan(chunk, found)
+    return frozenset(found)
 
-    # Collapse newlines and excess whitespace so multi-word skills
-    # (e.g. "machine learning") are not broken by PDF extraction artefacts
-    # like "machine\n \nlearning".
-    text = " ".join(text.split())
 
-    # Replace multi-word matches first so they are not broken by single-word pass
-    masked = text
-    for skill, pattern in _MULTI_WORD:
-        if pattern.search(masked):
-            found.add(skill.lower())
+def _scan(text: str, found: set[str]) -> None:
+    by_lower = _BY_LOWER
+    for m in _SKILLS_RE.finditer(text):
+        hit = m.group(1).lower()
+        if hit not in by_lower:
+            hit = " ".join(hit.split())  # phrase matched across a whitespace run
+        # Unicode case-folding can match e.g. "ſ" for "s"; .lower() does not undo that
+        found.add(by_lower.get(hit) or _slow_canonical(hit))
 
-    for skill, pattern in _SINGLE_WORD:
-        if pattern.search(masked):
-            found.add(skill.lower())
 
-    return found
+def _slow_canonical(hit: str) -> str:
+    return next(
+        _BY_LOWER[s] for s in _SPELLINGS if re.fullmatch(re.escape(s), hit, re.IGNORECASE)
+    )
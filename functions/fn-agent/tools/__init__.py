@@ -8,6 +8,10 @@ Tool names are aligned with the target specification:
   - analyze_fit                    (deterministic scoring + LLM narrative)
   - resume_summary                 (deterministic skills + LLM narrative)
   - list_jobs                      (metadata — Qdrant collection scan)
+
+Tools return compact JSON (model_dump_json() with no indent): the output
+is fed back into the agent's context, where indentation only costs tokens
+(~40% of a ranking result).
 """
 
 from __future__ import annotations
@@ -16,9 +16,8 @@ from llama_index.core.tools import FunctionTool
 
 from indexes.index_store import IndexStore
 from models.schemas import JobComparison, RankedJob
-from services.fit_scorer import coverage_score, skill_gap
+from services.fit_scorer import rank_fit
 from services.qdrant_reader import QdrantReader
-from services.skill_extractor import extract_skills
 
 logger = logging.getLogger(__name__)
 
@@ -40,27 +39,30 @@ def make_compare_jobs_tool(
         Returns:
             JSON string with JobComparison: ranked_jobs list and best_fit_job_id.
         """
-        resume_text = qdrant_reader.get_full_text("resume_chunks")
-        if not resume_text:
+        resume_skills = qdrant_reader.get_skills("resume_chunks")
+        if resume_skills is None:
             return json.dumps({"error": "Resume not uploaded yet."})
 
         job_ids = qdrant_reader.list_job_ids()
         if not job_ids:
             return json.dumps({"error": "No job descriptions uploaded yet."})
 
-        resume_skills = extract_skills(resume_text)
-        ranked: list[RankedJob] = []
+        # Titles and skills for every job in one concurrent wave; skills are
+        # scanned chunk by chunk, no job text is joined
+        titles, job_skills = qdrant_reader.get_titles_and_skills(job_ids)
 
+        scored_ids: list[str] = []
+        jobs_skills: list[frozenset[str]] = []
         for job_id in job_ids:
-            job_text = qdrant_reader.get_full_text(f"job_{job_id}")
-            if not job_text:
-                continue
-
-            job_skills = extract_skills(job_text)
-            score = coverage_score(resume_skills, job_skills)
-            matched, missing, _ = skill_gap(resume_skills, job_skills)
+            skills = job_skills[job_id]
+            if skills is not None:
+                scored_ids.append(job_id)
+                jobs_skills.append(skills)
 
-            title = qdrant_reader.get_first_line(f"job_{job_id}")
+        # Score and diff every job in one pass over skill bitmasks
+        ranked: list[RankedJob] = []
+        for job_id, (score, matched, missing) in zip(scored_ids, rank_fit(resume_skills, jobs_skills)):
+            title = titles[job_id]
 
             ranked.append(RankedJob(
                 job_id=job_id,
@@ -98,7 +100,7 @@ def make_compare_jobs_tool(
             "Ranked %d jobs, best fit: %s (%.3f)",
             len(ranked), best_id, ranked[0].fit_score if ranked else 0,
         )
-        return comparison.model_dump_json(indent=2)
+        return comparison.model_dump_json()
 
     return FunctionTool.from_defaults(
         fn=job_ranking_based_on_fit,
@@ -17,7 +17,6 @@ from indexes.index_store import IndexStore
 from models.schemas import FitScore
 from services.fit_scorer import coverage_score, skill_gap
 from services.qdrant_reader import QdrantReader
-from services.skill_extractor import extract_skills
 
 logger = logging.getLogger(__name__)
 
@@ -41,17 +40,15 @@ def make_compute_fit_score_tool(
             JSON string with FitScore fields: score, matched_skills,
             total_job_skills, matched_count.
         """
-        resume_text = qdrant_reader.get_full_text("resume_chunks")
-        if not resume_text:
+        # Skills only: chunks are scanned as they stream, no full text is built
+        resume_skills = qdrant_reader.get_skills("resume_chunks")
+        if resume_skills is None:
             return json.dumps({"error": "Resume not uploaded yet."})
 
-        job_text = qdrant_reader.get_full_text(f"job_{job_id}")
-        if not job_text:
+        job_skills = qdrant_reader.get_skills(f"job_{job_id}")
+        if job_skills is None:
             return json.dumps({"error": f"Job {job_id} not found or not uploaded yet."})
 
-        resume_skills = extract_skills(resume_text)
-        job_skills = extract_skills(job_text)
-
         score = coverage_score(resume_skills, job_skills)
         matched, _, _ = skill_gap(resume_skills, job_skills)
 
@@ -63,7 +60,7 @@ def make_compute_fit_score_tool(
             matched_count=len(matched),
         )
         logger.info("Fit score for job %s: %.3f (%d/%d skills)", job_id, score, len(matched), len(job_skills))
-        return result.model_dump_json(indent=2)
+        return result.model_dump_json()
 
     return FunctionTool.from_defaults(
         fn=fit_score,
@@ -1,7 +1,9 @@
 """Tool: interview_preparation_strategy(job_id)
 
 Builds a structured interview preparation plan.
-Skill gaps are computed deterministically; question generation uses the LLM.
+Skill gaps are computed deterministically; question generation uses the LLM —
+one JSON-mode call returns all three question lists, so the job context is
+sent once instead of three times.
 
 Tool name: interview_preparation_strategy (target spec compliant)
 """
@@ -18,55 +20,49 @@ from indexes.index_store import IndexStore
 from models.schemas import InterviewPlan
 from services.fit_scorer import skill_gap
 from services.qdrant_reader import QdrantReader
-from services.skill_extractor import extract_skills
 
 logger = logging.getLogger(__name__)
 
-_TECHNICAL_PROMPT = """\
-You are a senior technical interviewer. Based on the job description context and the
-candidate's skill gaps listed below, generate exactly 5 likely technical interview
-questions. Focus on the gaps — areas the candidate may be weak in.
+_INTERVIEW_PROMPT = """\
+You are preparing a candidate for an interview. Using the job context, the
+candidate's skill gaps and resume highlights below, produce:
 
-Job context: {job_ctx}
-Skill gaps: {gaps}
-
-Return ONLY a JSON array of 5 question strings. Example:
-["Question 1?", "Question 2?", ...]"""
-
-_BEHAVIORAL_PROMPT = """\
-You are a senior HR interviewer. Based on the job context below, generate exactly
-5 likely behavioral interview questions (STAR format) relevant to this role.
+- "technical": exactly 5 likely technical interview questions (as a senior
+  technical interviewer). Focus on the gaps — areas the candidate may be weak in.
+- "behavioral": exactly 5 likely behavioral interview questions (as a senior HR
+  interviewer, STAR format) relevant to this role.
+- "storytelling": exactly 3 storytelling angles the candidate should prepare (as a
+  career coach) — specific experiences they should be ready to narrate for this job.
 
 Job context: {job_ctx}
+Skill gaps: {gaps}
+Resume highlights: {resume_ctx}
 
-Return ONLY a JSON array of 5 question strings."""
+Return ONLY a JSON object of question strings:
+{{"technical": ["...", ...], "behavioral": ["...", ...], "storytelling": ["...", ...]}}"""
 
-_STORYTELLING_PROMPT = """\
-You are a career coach. Based on the candidate's resume highlights below,
-suggest exactly 3 storytelling angles the candidate should prepare —
-specific experiences they should be ready to narrate for this job.
+# (JSON key, number of items kept)
+_SECTIONS = (("technical", 5), ("behavioral", 5), ("storytelling", 3))
 
-Resume highlights: {resume_ctx}
-Job context: {job_ctx}
 
-Return ONLY a JSON array of 3 short suggestion strings."""
+def _json_mode(llm: LLM) -> LLM:
+    """Copy of llm with constrained JSON decoding (Ollama json_mode), if it supports it."""
+    if "json_mode" in type(llm).model_fields:
+        return llm.model_copy(update={"json_mode": True})
+    return llm
 
 
-def _safe_parse_list(text: str, fallback_count: int = 5) -> list[str]:
-    """Parse a JSON array from LLM output, with fallback."""
-    text = text.strip()
-    start = text.find("[")
-    end = text.rfind("]") + 1
-    if start >= 0 and end > start:
-        try:
-            result = json.loads(text[start:end])
-            if isinstance(result, list):
-                return [str(x) for x in result]
-        except json.JSONDecodeError:
-            pass
-    # Fallback: split lines
-    lines = [l.strip(" -•*\"'") for l in text.splitlines() if l.strip()]
-    return lines[:fallback_count] if lines else [text[:200]]
+def _parse_sections(text: str) -> dict[str, list[str]]:
+    """Question lists from the JSON answer; a section that is not a list is empty."""
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    sections: dict[str, list[str]] = {}
+    for key, count in _SECTIONS:
+        value = data.get(key)
+        # A string or object here would otherwise iterate into characters / keys
+        sections[key] = [str(x) for x in value][:count] if isinstance(value, list) else []
+    return sections
 
 
 def make_interview_plan_tool(
@@ -74,6 +70,7 @@ def make_interview_plan_tool(
     qdrant_reader: QdrantReader,
     llm: LLM,
 ) -> FunctionTool:
+    json_llm = _json_mode(llm)
 
     def interview_preparation_strategy(job_id: str) -> str:
         """Generate a structured interview preparation strategy for a specific job.
@@ -91,77 +88,53 @@ def make_interview_plan_tool(
         Returns:
             JSON string with InterviewPlan fields.
         """
-        resume_text = qdrant_reader.get_full_text("resume_chunks")
-        if not resume_text:
+        resume_skills = qdrant_reader.get_skills("resume_chunks")
+        if resume_skills is None:
             return json.dumps({"error": "Resume not uploaded yet."})
 
-        job_text = qdrant_reader.get_full_text(f"job_{job_id}")
-        if not job_text:
+        job_skills = qdrant_reader.get_skills(f"job_{job_id}")
+        if job_skills is None:
             return json.dumps({"error": f"Job {job_id} not found."})
 
-        resume_skills = extract_skills(resume_text)
-        job_skills = extract_skills(job_text)
         _, missing, _ = skill_gap(resume_skills, job_skills)
 
         # Grounded retrieval from indexes
-        job_ctx = job_text[:1500]
-        resume_ctx = resume_text[:1200]
-
-        job_idx = index_store.job(job_id)
-        resume_idx = index_store.resume()
-        if job_idx:
-            try:
-                qe = job_idx.as_query_engine(llm=llm, similarity_top_k=4)
-                job_ctx = str(qe.query("What are the key technical requirements and responsibilities?"))
-            except Exception as exc:
-                logger.warning("Job index query failed: %s", exc)
-
-        if resume_idx:
-            try:
-                qe = resume_idx.as_query_engine(llm=llm, similarity_top_k=3)
-                resume_ctx = str(qe.query("What are the candidate's most notable technical achievements?"))
-            except Exception as exc:
-                logger.warning("Resume index query failed: %s", exc)
+        # (both queries run concurrently; a failed one falls back to raw text)
+        job_answer, resume_answer = index_store.query_concurrently(
+            (index_store.job_query_engine(job_id, llm, top_k=4),
+             "What are the key technical requirements and responsibilities?"),
+            (index_store.resume_query_engine(llm, top_k=3),
+             "What are the candidate's most notable technical achievements?"),
+        )
+        # Each context is cut once, to what the prompt uses; raw text is only
+        # read (leading chunks alone) when its query produced nothing
+        job_ctx = (job_answer or qdrant_reader.get_text_prefix(f"job_{job_id}", 800) or "")[:800]
+        resume_ctx = (resume_answer or qdrant_reader.get_text_prefix("resume_chunks", 800) or "")[:800]
 
         gaps_str = ", ".join(missing[:12]) if missing else "none identified"
 
-        tech_questions: list[str] = []
-        behavioral_questions: list[str] = []
-        storytelling: list[str] = []
-
-        try:
-            raw = llm.complete(_TECHNICAL_PROMPT.format(job_ctx=job_ctx[:800], gaps=gaps_str)).text
-            tech_questions = _safe_parse_list(raw, 5)
-        except Exception as exc:
-            logger.warning("Technical questions failed: %s", exc)
-
-        try:
-            raw = llm.complete(_BEHAVIORAL_PROMPT.format(job_ctx=job_ctx[:800])).text
-            behavioral_questions = _safe_parse_list(raw, 5)
-        except Exception as exc:
-            logger.warning("Behavioral questions failed: %s", exc)
-
+        sections: dict[str, list[str]] = {key: [] for key, _ in _SECTIONS}
         try:
-            raw = llm.complete(_STORYTELLING_PROMPT.format(
-                resume_ctx=resume_ctx[:800], job_ctx=job_ctx[:600]
+            raw = json_llm.complete(_INTERVIEW_PROMPT.format(
+                job_ctx=job_ctx, gaps=gaps_str, resume_ctx=resume_ctx,
             )).text
-            storytelling = _safe_parse_list(raw, 3)
+            sections = _parse_sections(raw)
         except Exception as exc:
-            logger.warning("Storytelling suggestions failed: %s", exc)
+            logger.warning("Interview question generation failed: %s", exc)
 
         plan = InterviewPlan(
             job_id=job_id,
             focus_areas=missing[:8],
-            technical_questions=tech_questions,
-            behavioral_questions=behavioral_questions,
-            storytelling_suggestions=storytelling,
+            technical_questions=sections["technical"],
+            behavioral_questions=sections["behavioral"],
+            storytelling_suggestions=sections["storytelling"],
             prep_tips=(
                 "Review the missing skills listed in focus_areas. "
                 "Prepare concrete STAR stories for behavioral questions. "
                 "Brush up on any technical gaps before the interview."
             ),
         )
-        return plan.model_dump_json(indent=2)
+        return plan.model_dump_json()
 
     return FunctionTool.from_defaults(
         fn=interview_preparation_strategy,
@@ -6,9 +6,9 @@ Simple utility for counting and listing jobs without requiring a resume.
 
 from __future__ import annotations
 
-import json
 import logging
 
+import orjson
 from llama_index.core.tools import FunctionTool
 
 from services.qdrant_reader import QdrantReader
@@ -33,15 +33,16 @@ def make_list_jobs_tool(
         job_ids = qdrant_reader.list_job_ids()
 
         if not job_ids:
-            return json.dumps({
+            return orjson.dumps({
                 "count": 0,
                 "jobs": [],
                 "message": "No job descriptions uploaded yet."
-            })
+            }).decode()
 
+        titles = qdrant_reader.get_first_lines(job_ids)
         jobs = []
         for job_id in job_ids:
-            title = qdrant_reader.get_first_line(f"job_{job_id}")
+            title = titles[job_id]
             jobs.append({
                 "job_id": job_id,
                 "title": title or f"Job {job_id}",
@@ -53,7 +54,8 @@ def make_list_jobs_tool(
         }
 
         logger.info("Listed %d jobs", len(jobs))
-        return json.dumps(result, indent=2)
+        # orjson's output is already compact and non-ASCII-escaped
+        return orjson.dumps(result).decode()
 
     return FunctionTool.from_defaults(
         fn=list_jobs,
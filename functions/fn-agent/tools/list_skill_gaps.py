@@ -17,7 +17,6 @@ from indexes.index_store import IndexStore
 from models.schemas import SkillGapReport
 from services.fit_scorer import skill_gap
 from services.qdrant_reader import QdrantReader
-from services.skill_extractor import extract_skills
 
 logger = logging.getLogger(__name__)
 
@@ -43,20 +42,19 @@ def make_list_skill_gaps_tool(
         Returns:
             JSON string with SkillGapReport fields.
         """
-        resume_text = qdrant_reader.get_full_text("resume_chunks")
-        if not resume_text:
+        # Skills only: chunks are scanned as they stream, no full text is built
+        resume_skills = qdrant_reader.get_skills("resume_chunks")
+        if resume_skills is None:
             return json.dumps({"error": "Resume not uploaded yet."})
 
-        job_text = qdrant_reader.get_full_text(f"job_{job_id}")
-        if not job_text:
+        job_skills = qdrant_reader.get_skills(f"job_{job_id}")
+        if job_skills is None:
             return json.dumps({"error": f"Job {job_id} not found."})
 
-        resume_skills = extract_skills(resume_text)
-        job_skills = extract_skills(job_text)
-
         matched, missing, bonus = skill_gap(resume_skills, job_skills)
 
-        report = SkillGapReport(
+        # skill_gap() already yields exactly the schema's types — skip validation
+        report = SkillGapReport.model_construct(
             job_id=job_id,
             missing_skills=missing,
             matching_skills=matched,
@@ -66,7 +64,7 @@ def make_list_skill_gaps_tool(
             "Skill gap for job %s: %d missing, %d matching, %d bonus",
             job_id, len(missing), len(matched), len(bonus),
         )
-        return report.model_dump_json(indent=2)
+        return report.model_dump_json()
 
     return FunctionTool.from_defaults(
         fn=skill_gap_analysis,
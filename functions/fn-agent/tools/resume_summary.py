@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import json
 import logging
+from typing import Optional
 
 from llama_index.core.llms import LLM
 from llama_index.core.tools import FunctionTool
@@ -15,7 +16,6 @@ from llama_index.core.tools import FunctionTool
 from indexes.index_store import IndexStore
 from models.schemas import ResumeSummary
 from services.qdrant_reader import QdrantReader
-from services.skill_extractor import extract_skills
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +32,21 @@ strongest technical areas, and career trajectory. Be specific and factual.
 Do not invent anything not present in the context."""
 
 
+# Detected skills reported as technologies; every other skill is a general skill
+_TECH_KEYWORDS = frozenset({
+    "pytorch", "tensorflow", "keras", "opencv", "yolo", "docker", "kubernetes",
+    "qdrant", "pinecone", "mlflow", "onnx", "openvino", "fastapi", "aws", "gcp",
+    "azure", "python", "c++", "java", "typescript", "spark", "kafka", "huggingface",
+})
+
+
+def _bullet_lines(answer: Optional[str]) -> list[str]:
+    """Non-empty lines of a query answer with list markers stripped."""
+    if not answer:
+        return []
+    return [line.strip(" -•*") for line in answer.splitlines() if line.strip()]
+
+
 def make_resume_summary_tool(
     index_store: IndexStore,
     qdrant_reader: QdrantReader,
@@ -49,62 +64,40 @@ def make_resume_summary_tool(
             JSON string with ResumeSummary fields: skills, technologies,
             experience_highlights, education, narrative.
         """
-        resume_text = qdrant_reader.get_full_text("resume_chunks")
-        if not resume_text:
+        resume_skills = qdrant_reader.get_skills("resume_chunks")
+        if resume_skills is None:
             return json.dumps({"error": "Resume not uploaded yet. Please upload a resume first."})
 
-        detected_skills = sorted(extract_skills(resume_text))
+        # Both retrieval queries run concurrently (a failed one yields None)
+        qe = index_store.resume_query_engine(llm, top_k=5)
+        exp_answer, edu_answer = index_store.query_concurrently(
+            (qe, "List the candidate's work experience, job titles, companies, and key achievements."),
+            (qe, "What degrees, certifications, or educational qualifications does the candidate have?"),
+        )
+        experience_highlights = _bullet_lines(exp_answer)[:8]
+        education = _bullet_lines(edu_answer)[:5]
 
-        resume_ctx = resume_text[:2000]
-        experience_highlights: list[str] = []
-        education: list[str] = []
+        if exp_answer is not None:
+            resume_ctx = exp_answer[:1200]
+        else:
+            # Fallback context: only the resume's leading chunks are read
+            resume_ctx = qdrant_reader.get_text_prefix("resume_chunks", 1200) or ""
 
-        resume_idx = index_store.resume()
-        if resume_idx:
+        # LLM narrative — skipped when there is nothing to ground it in
+        narrative = ""
+        if resume_skills or resume_ctx:
             try:
-                qe = resume_idx.as_query_engine(llm=llm, similarity_top_k=5)
-
-                exp_response = qe.query(
-                    "List the candidate's work experience, job titles, companies, and key achievements."
-                )
-                experience_highlights = [
-                    line.strip(" -•*")
-                    for line in str(exp_response).splitlines()
-                    if line.strip()
-                ][:8]
-
-                edu_response = qe.query(
-                    "What degrees, certifications, or educational qualifications does the candidate have?"
+                prompt = _SUMMARY_PROMPT.format(
+                    resume_ctx=resume_ctx,
+                    skills=", ".join(sorted(resume_skills)[:25]),
                 )
-                education = [
-                    line.strip(" -•*")
-                    for line in str(edu_response).splitlines()
-                    if line.strip()
-                ][:5]
-
-                resume_ctx = str(exp_response)[:1500]
+                narrative = llm.complete(prompt).text.strip()
             except Exception as exc:
-                logger.warning("Resume index query failed: %s", exc)
-
-        # LLM narrative
-        narrative = ""
-        try:
-            prompt = _SUMMARY_PROMPT.format(
-                resume_ctx=resume_ctx[:1200],
-                skills=", ".join(detected_skills[:25]),
-            )
-            narrative = llm.complete(prompt).text.strip()
-        except Exception as exc:
-            logger.warning("Narrative generation failed: %s", exc)
+                logger.warning("Narrative generation failed: %s", exc)
 
         # Split skills into general skills vs technologies
-        tech_keywords = {
-            "pytorch", "tensorflow", "keras", "opencv", "yolo", "docker", "kubernetes",
-            "qdrant", "pinecone", "mlflow", "onnx", "openvino", "fastapi", "aws", "gcp",
-            "azure", "python", "c++", "java", "typescript", "spark", "kafka", "huggingface",
-        }
-        technologies = sorted(s for s in detected_skills if s in tech_keywords)
-        skills = sorted(s for s in detected_skills if s not in tech_keywords)
+        technologies = sorted(resume_skills & _TECH_KEYWORDS)
+        skills = sorted(resume_skills - _TECH_KEYWORDS)
 
         summary = ResumeSummary(
             skills=skills,
@@ -113,7 +106,7 @@ def make_resume_summary_tool(
             education=education,
             narrative=narrative,
         )
-        return summary.model_dump_json(indent=2)
+        return summary.model_dump_json()
 
     return FunctionTool.from_defaults(
         fn=resume_summary,
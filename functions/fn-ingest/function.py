@@ -4,7 +4,14 @@ Nuclio function contract:
   init_context(context)  — load SentenceTransformer + QdrantClient ONCE
   handler(context, event) — chunk text, embed, upsert to Qdrant
 
-Expected POST body:
+Expected POST (preferred — raw text body, metadata in headers):
+  Content-Type: text/plain; charset=utf-8
+  X-Collection: str              # Qdrant collection to write to
+  X-Source:     str              # "resume" | "job"
+  X-Job-Id:     str              # present (non-empty) for job documents
+  <body>        extracted document text
+
+Legacy JSON body (still accepted when Content-Type is application/json):
   {
     "text":            str,        # extracted document text
     "collection_name": str,        # Qdrant collection to write to
@@ -17,22 +24,48 @@ Success response:
 
 This function is the ONLY place where sentence-transformers is loaded.
 The backend never touches embeddings.
+
+Requests are served on concurrent threads; embedding goes through one
+_BatchEmbedder, which encodes the chunks of uploads that arrive together
+in a single forward pass.
+
+Point ids are deterministic (uuid5 of collection, chunk index and chunk
+text), so an upload replaces the collection's previous contents instead
+of adding to them, and points the new upload does not produce are
+deleted. Each point also stores its chunk's content_hash: a chunk whose
+text is already in the collection, at any index, reuses the stored
+vector instead of being re-embedded.
+Every point of an upload carries the same fresh "ingest_id", which
+fn-agent reads to detect that a collection changed. Uploads to the same
+collection are serialised (embedding included), so the last one to
+finish is the collection's content; uploads to different collections
+still run, and batch their embeddings, concurrently.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
-import re
+import queue
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass
-from uuid import uuid4
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+from shared.chunking import chunk_text
 
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))  # 0 = REST only
 EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
-EMBEDDING_DIM = 384
-CHUNK_SIZE = 800     # estimated tokens (4 chars ≈ 1 token)
-CHUNK_OVERLAP = 150  # estimated tokens
+EMBEDDING_DIM = 384  # float32 on the wire and on disk; int8 copy in RAM (see _ensure_collection)
+EMBED_BATCH_CHUNKS = 64  # chunks coalesced into one encode() across requests
+UPSERT_BATCH = 64  # points per Qdrant upsert request
+_POINT_ID_NAMESPACE = uuid5(NAMESPACE_URL, "career-ai-assistant/fn-ingest/chunk")
+
+_collections_lock = threading.Lock()  # concurrent first uploads must not both create
+_ingest_locks: dict[str, threading.Lock] = {}  # collection → lock; created under _collections_lock
 
 
 # ---------------------------------------------------------------------------
@@ -41,7 +74,7 @@ CHUNK_OVERLAP = 150  # estimated tokens
 
 @dataclass
 class Response:
-    body: str = ""
+    body: bytes = b""  # pre-encoded; the runner writes it as-is
     status_code: int = 200
     content_type: str = "application/json"
 
@@ -61,9 +94,20 @@ def init_context(context) -> None:
 
     context.logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
     context.user_data.embed_model = SentenceTransformer(EMBEDDING_MODEL)
-
-    context.logger.info(f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}")
-    context.user_data.qdrant = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    context.user_data.embedder = _BatchEmbedder(context.user_data.embed_model)
+
+    # Over gRPC each vector is sent as packed float32 (1.5 KB); REST JSON
+    # spells every component out as a decimal double (~8 KB per vector)
+    context.logger.info(
+        f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}"
+        + (f" (gRPC :{QDRANT_GRPC_PORT})" if QDRANT_GRPC_PORT else "")
+    )
+    if QDRANT_GRPC_PORT:
+        context.user_data.qdrant = QdrantClient(
+            host=QDRANT_HOST, port=QDRANT_PORT, grpc_port=QDRANT_GRPC_PORT, prefer_grpc=True,
+        )
+    else:
+        context.user_data.qdrant = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
 
     context.logger.info("fn-ingest ready")
 
@@ -75,111 +119,250 @@ def handler(context, event) -> Response:
     """
     # --- Parse ---
     try:
-        data = event.get_json()
-        text: str = data["text"]
-        collection_name: str = data["collection_name"]
-        source: str = data.get("source", "unknown")
-        job_id: str | None = data.get("job_id")
+        text, collection_name, source, job_id = _parse_request(event)
     except (KeyError, json.JSONDecodeError, ValueError) as exc:
         return Response(
-            body=json.dumps({"error": f"Bad request: {exc}"}),
+            body=json.dumps({"error": f"Bad request: {exc}"}).encode(),
             status_code=400,
         )
 
     # --- Chunk ---
-    chunks = _chunk_text(text)
+    chunks = chunk_text(text)  # shared CHUNK_SIZE / CHUNK_OVERLAP (800 / 150 est. tokens)
     if not chunks:
         return Response(
-            body=json.dumps({"error": "No text chunks produced from input"}),
+            body=json.dumps({"error": "No text chunks produced from input"}).encode(),
             status_code=400,
         )
 
-    # --- Embed ---
-    vectors = context.user_data.embed_model.encode(
-        chunks, normalize_embeddings=True, show_progress_bar=False
-    ).tolist()
-
-    # --- Store ---
-    _ensure_collection(context.user_data.qdrant, collection_name)
-    _upsert(context.user_data.qdrant, collection_name, chunks, vectors, source, job_id)
-
-    context.logger.info(f"Ingested {len(chunks)} chunks into '{collection_name}'")
+    qdrant = context.user_data.qdrant
+    with _collections_lock:
+        _ensure_collection(qdrant, collection_name)
+        ingest_lock = _ingest_locks.setdefault(collection_name, threading.Lock())
+
+    hashes = [_content_hash(chunk) for chunk in chunks]
+    ids = [_point_id(collection_name, i, h) for i, h in enumerate(hashes)]
+
+    # One ingest per collection at a time: _delete_stale keeps only this
+    # upload's ids, so two interleaved uploads would delete each other's
+    # points and leave the collection empty
+    with ingest_lock:
+        # --- Embed (only chunks whose text is not stored yet) ---
+        stored = _stored_vectors(qdrant, collection_name)
+        missing = [i for i, h in enumerate(hashes) if h not in stored]
+        fresh = iter(context.user_data.embedder.encode([chunks[i] for i in missing]) if missing else [])
+        vectors = [stored[h] if h in stored else next(fresh) for h in hashes]
+
+        # --- Store ---
+        _upsert(qdrant, collection_name, ids, hashes, chunks, vectors, source, job_id)
+        _delete_stale(qdrant, collection_name, ids)
+
+    context.logger.info(
+        f"Ingested {len(chunks)} chunks into '{collection_name}' "
+        f"({len(missing)} embedded, {len(chunks) - len(missing)} reused)"
+    )
     return Response(body=json.dumps({
         "status": "ok",
         "chunks": len(chunks),
         "collection": collection_name,
-    }))
+    }).encode())
 
 
 # ---------------------------------------------------------------------------
-# Internal helpers — no ML imports, only stdlib + qdrant-client
+# Embedding micro-batcher
 # ---------------------------------------------------------------------------
 
-def _chunk_text(text: str) -> list[str]:
-    """Split text into overlapping chunks on sentence boundaries.
+class _BatchEmbedder:
+    """Coalesce encode() calls from concurrent requests into one forward pass.
 
-    Uses the same algorithm as the original shared/chunking.py so that
-    chunk size and overlap are consistent with what was used before.
+    One worker thread owns the model. Uploads that arrive while it is
+    encoding queue up and are encoded together on its next pass, up to
+    EMBED_BATCH_CHUNKS chunks (a single larger upload still goes alone).
+    An idle server therefore adds no batching delay; a busy one pays the
+    per-call model overhead once per batch instead of once per request.
     """
-    text = re.sub(r"\n{3,}", "\n\n", text.strip())
-    if not text:
-        return []
-
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    chunks: list[str] = []
-    current: list[str] = []
-    current_tokens = 0
-
-    for sentence in sentences:
-        s_tokens = len(sentence) // 4
-        if current_tokens + s_tokens > CHUNK_SIZE and current:
-            chunks.append(" ".join(current))
-            # Carry over tail overlap
-            overlap: list[str] = []
-            overlap_tokens = 0
-            for s in reversed(current):
-                t = len(s) // 4
-                if overlap_tokens + t > CHUNK_OVERLAP:
+
+    def __init__(self, model) -> None:
+        self._model = model
+        self._queue: queue.Queue[tuple[list[str], Future]] = queue.Queue()
+        threading.Thread(target=self._run, name="embedder", daemon=True).start()
+
+    def encode(self, chunks: list[str]) -> list[list[float]]:
+        """Return normalised embeddings for *chunks*, in order."""
+        future: Future = Future()
+        self._queue.put((chunks, future))
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            while size < EMBED_BATCH_CHUNKS:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
                     break
-                overlap.insert(0, s)
-                overlap_tokens += t
-            current, current_tokens = overlap, overlap_tokens
-        current.append(sentence)
-        current_tokens += s_tokens
+                batch.append(item)
+                size += len(item[0])
+
+            texts = [chunk for chunks, _ in batch for chunk in chunks]
+            try:
+                vectors = self._model.encode(
+                    texts,
+                    batch_size=EMBED_BATCH_CHUNKS,
+                    normalize_embeddings=True,
+                    show_progress_bar=False,
+                ).tolist()
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            start = 0
+            for chunks, future in batch:
+                future.set_result(vectors[start:start + len(chunks)])
+                start += len(chunks)
 
-    if current:
-        chunks.append(" ".join(current))
-    return chunks
+
+# ---------------------------------------------------------------------------
+# Internal helpers — no ML imports, only stdlib + qdrant-client
+# ---------------------------------------------------------------------------
+
+def _parse_request(event) -> tuple[str, str, str, str | None]:
+    """Return (text, collection_name, source, job_id) from either request shape.
+
+    The raw-text form avoids JSON string escaping of large documents on both
+    sides; the JSON form is kept for older callers.
+    """
+    headers = {k.lower(): v for k, v in (event.headers or {}).items()}
+    if headers.get("content-type", "").startswith("application/json"):
+        data = event.get_json()
+        return (
+            data["text"],
+            data["collection_name"],
+            data.get("source", "unknown"),
+            data.get("job_id"),
+        )
+    collection_name = headers.get("x-collection")
+    if not collection_name:
+        raise KeyError("X-Collection header")
+    return (
+        event.body.decode("utf-8", errors="replace"),
+        collection_name,
+        headers.get("x-source", "unknown"),
+        headers.get("x-job-id") or None,
+    )
 
 
 def _ensure_collection(qdrant, collection_name: str) -> None:
-    """Create Qdrant collection if it does not exist."""
-    from qdrant_client.models import Distance, VectorParams
+    """Create Qdrant collection if it does not exist.
+
+    Vectors are also stored int8 scalar-quantized (kept in RAM): searches
+    scan the 4x smaller int8 copy, then rescore the top hits against the
+    original float32 vectors, so ranking quality is unchanged in practice.
+    The int8 range is fitted to the 0.99 quantile of component values, so
+    a few outliers do not stretch it and cost resolution everywhere else.
+    """
+    from qdrant_client.models import (
+        Distance,
+        PayloadSchemaType,
+        ScalarQuantization,
+        ScalarQuantizationConfig,
+        ScalarType,
+        VectorParams,
+    )
 
     existing = {c.name for c in qdrant.get_collections().collections}
     if collection_name not in existing:
         qdrant.create_collection(
             collection_name=collection_name,
             vectors_config=VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE),
+            quantization_config=ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True),
+            ),
         )
+        # fn-agent fetches a document's first chunk by chunk_index == 0
+        qdrant.create_payload_index(
+            collection_name=collection_name,
+            field_name="chunk_index",
+            field_schema=PayloadSchemaType.INTEGER,
+        )
+
 
+def _content_hash(chunk: str) -> str:
+    return hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).hexdigest()
 
-def _upsert(qdrant, collection_name: str, chunks, vectors, source, job_id) -> None:
-    """Upsert chunk vectors into Qdrant."""
+
+def _point_id(collection_name: str, chunk_index: int, content_hash: str) -> str:
+    return str(uuid5(_POINT_ID_NAMESPACE, f"{collection_name}:{chunk_index}:{content_hash}"))
+
+
+def _stored_vectors(qdrant, collection_name: str) -> dict[str, list[float]]:
+    """Return {content_hash: vector} for the chunks already in the collection.
+
+    A collection holds one document (3-8 chunks typically), so reading all
+    of its vectors is cheaper than embedding even one chunk. Points from
+    ingests before content_hash existed are simply not reusable.
+    """
+    stored: dict[str, list[float]] = {}
+    offset = None
+    while True:
+        points, offset = qdrant.scroll(
+            collection_name=collection_name,
+            limit=UPSERT_BATCH,
+            offset=offset,
+            with_payload=["content_hash"],
+            with_vectors=True,
+        )
+        for p in points:
+            content_hash = (p.payload or {}).get("content_hash")
+            if content_hash and p.vector:
+                stored[content_hash] = p.vector
+        if offset is None:
+            return stored
+
+
+def _delete_stale(qdrant, collection_name: str, keep_ids: list[str]) -> None:
+    """Delete every point of a previous upload that this upload did not write."""
+    from qdrant_client.models import Filter, FilterSelector, HasIdCondition
+
+    qdrant.delete(
+        collection_name=collection_name,
+        points_selector=FilterSelector(filter=Filter(must_not=[HasIdCondition(has_id=keep_ids)])),
+        wait=True,
+    )
+
+
+def _upsert(qdrant, collection_name: str, ids, hashes, chunks, vectors, source, job_id) -> None:
+    """Upsert chunk vectors into Qdrant.
+
+    Points are streamed to upload_points() in UPSERT_BATCH-point requests
+    (retried on transient errors) instead of one request for the whole
+    document. wait=True is kept: the backend reports the document ready
+    when this returns, and the agent may read it on the very next message.
+    """
     from qdrant_client.models import PointStruct
 
-    points = [
+    total = len(chunks)
+    ingest_id = str(uuid4())
+    points = (
         PointStruct(
-            id=str(uuid4()),
+            id=point_id,
             vector=vector,
             payload={
                 "text": chunk,
                 "source": source,
                 "job_id": job_id,
                 "chunk_index": i,
-                "total_chunks": len(chunks),
+                "total_chunks": total,
+                "ingest_id": ingest_id,
+                "content_hash": content_hash,
             },
         )
-        for i, (chunk, vector) in enumerate(zip(chunks, vectors))
-    ]
-    qdrant.upsert(collection_name=collection_name, points=points)
+        for i, (point_id, content_hash, chunk, vector) in enumerate(zip(ids, hashes, chunks, vectors))
+    )
+    qdrant.upload_points(
+        collection_name=collection_name,
+        points=points,
+        batch_size=UPSERT_BATCH,
+        wait=True,
+    )
@@ -5,7 +5,10 @@ Simulates the Nuclio serverless runtime contract:
   - init_context(context): called ONCE at startup with a Context object
   - handler(context, event): called per HTTP request
 
-Pure Python stdlib http.server.
+Pure Python stdlib http.server. Requests are served on concurrent
+threads (ThreadingHTTPServer), so uploads arriving together can share
+one embedding pass (see function._BatchEmbedder). Speaks HTTP/1.0 (one
+request per connection); each response is written in a single send.
 
 To port to real Nuclio: keep function.py unchanged, replace this runner
 with a Nuclio function YAML that references function.py as the handler.
@@ -16,7 +19,7 @@ from __future__ import annotations
 import json
 import logging
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
 logging.basicConfig(
@@ -25,6 +28,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger("nuclio_runner")
 
+from function import handler, init_context  # noqa: E402 — after logging setup
+
 
 # ---------------------------------------------------------------------------
 # Nuclio runtime primitives
@@ -90,7 +95,6 @@ class _Handler(BaseHTTPRequestHandler):
         body = self.rfile.read(length) if length else b""
         event = Event(body=body, headers=dict(self.headers), path=self.path, method=method)
         try:
-            from function import handler
             response = handler(_ctx, event)
         except Exception as exc:
             logger.exception("Handler error: %s", exc)
@@ -105,11 +109,18 @@ class _Handler(BaseHTTPRequestHandler):
             getattr(response, "content_type", "application/json"),
         )
 
-    def _respond_raw(self, code: int, body: str, ct: str = "application/json") -> None:
-        self.send_response(code)
-        self.send_header("Content-Type", ct)
-        self.end_headers()
-        self.wfile.write(body.encode() if isinstance(body, str) else body)
+    def _respond_raw(self, code: int, body: bytes | str, ct: str = "application/json") -> None:
+        """Send status line, headers and body in one write (one syscall)."""
+        if isinstance(body, str):
+            body = body.encode()
+        self.log_request(code)
+        self.wfile.write(self._head(code, ct, b"Content-Length: %d\r\n" % len(body)) + body)
+
+    def _head(self, code: int, ct: str, extra: bytes = b"") -> bytes:
+        reason = self.responses.get(code, ("",))[0]
+        return b"%s %d %s\r\nContent-Type: %s\r\n%s\r\n" % (
+            self.protocol_version.encode(), code, reason.encode(), ct.encode(), extra,
+        )
 
     def log_message(self, fmt: str, *args: Any) -> None:
         logger.info(fmt, *args)
@@ -131,10 +142,9 @@ if __name__ == "__main__":
 
     # Initialise context — mimics Nuclio calling init_context() once
     _ctx = Context()
-    from function import init_context
     logger.info("Calling init_context() ...")
     init_context(_ctx)
     logger.info("Function ready on port %d", port)
 
-    server = HTTPServer(("0.0.0.0", port), _Handler)
+    server = ThreadingHTTPServer(("0.0.0.0", port), _Handler)
     server.serve_forever()
@@ -0,0 +1,124 @@
+"""Tests for fn-ingest's handler against an in-memory Qdrant stand-in.
+
+Run from the repository root:
+    python -m unittest discover -s functions/fn-ingest/tests
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+_FN_DIR = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(_FN_DIR), str(_FN_DIR.parents[1])]  # function.py, shared/
+
+import function  # noqa: E402
+
+
+class _FakeQdrant:
+    """The subset of QdrantClient the handler uses, backed by a dict.
+
+    Writes sleep briefly so that concurrent handlers interleave.
+    """
+
+    def __init__(self) -> None:
+        self.points: dict[str, dict[str, object]] = {}  # collection → {id: point}
+        self._lock = threading.Lock()
+
+    def get_collections(self):
+        return SimpleNamespace(collections=[SimpleNamespace(name=n) for n in self.points])
+
+    def create_collection(self, collection_name, **_):
+        self.points[collection_name] = {}
+
+    def create_payload_index(self, **_):
+        pass
+
+    def scroll(self, collection_name, limit, offset=None, **_):
+        with self._lock:
+            points = list(self.points[collection_name].values())
+        start = offset or 0
+        end = start + limit
+        return points[start:end], (end if end < len(points) else None)
+
+    def upload_points(self, collection_name, points, **_):
+        points = list(points)
+        time.sleep(0.05)
+        with self._lock:
+            for p in points:
+                self.points[collection_name][p.id] = p
+
+    def delete(self, collection_name, points_selector, **_):
+        keep = set(points_selector.filter.must_not[0].has_id)
+        time.sleep(0.05)
+        with self._lock:
+            stored = self.points[collection_name]
+            for point_id in [i for i in stored if i not in keep]:
+                del stored[point_id]
+
+
+class _FakeEmbedder:
+    def encode(self, chunks):
+        return [[float(len(chunk))] * function.EMBEDDING_DIM for chunk in chunks]
+
+
+def _event(text: str, collection: str = "resume_chunks"):
+    return SimpleNamespace(
+        headers={"X-Collection": collection, "X-Source": "resume"},
+        body=text.encode(),
+    )
+
+
+class ConcurrentIngestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.qdrant = _FakeQdrant()
+        self.context = SimpleNamespace(
+            user_data=SimpleNamespace(qdrant=self.qdrant, embedder=_FakeEmbedder()),
+            logger=logging.getLogger("test"),
+        )
+
+    def _texts_in(self, collection: str) -> set[str]:
+        return {p.payload["text"] for p in self.qdrant.points[collection].values()}
+
+    def test_concurrent_uploads_leave_one_complete_document(self) -> None:
+        docs = {
+            "a": "Resume A. Python and Docker. " * 400,
+            "b": "Resume B. Rust and Kubernetes. " * 300,
+        }
+        chunks = {key: set(function.chunk_text(text)) for key, text in docs.items()}
+        responses = {}
+
+        def ingest(key: str) -> None:
+            responses[key] = function.handler(self.context, _event(docs[key]))
+
+        threads = [threading.Thread(target=ingest, args=(key,)) for key in docs]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertTrue(all(r.status_code == 200 for r in responses.values()))
+        stored = self._texts_in("resume_chunks")
+        self.assertIn(stored, (chunks["a"], chunks["b"]))
+
+    def test_uploads_to_different_collections_are_independent(self) -> None:
+        threads = [
+            threading.Thread(target=function.handler, args=(self.context, _event(f"Job {n}. Go.", f"job_{n}")))
+            for n in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for n in range(3):
+            self.assertEqual(self._texts_in(f"job_{n}"), {f"Job {n}. Go."})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,9 @@ import re
 CHUNK_SIZE = 800
 CHUNK_OVERLAP = 150
 
+_MULTI_NL_RE = re.compile(r"\n{3,}")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 def estimate_tokens(text: str) -> int:
     """Rough token count estimate (~4 chars per token for English)."""
@@ -22,39 +25,34 @@ def chunk_text(
 
     Uses sentence boundaries when possible to avoid splitting mid-sentence.
     """
-    text = re.sub(r"\n{3,}", "\n\n", text.strip())
+    text = _MULTI_NL_RE.sub("\n\n", text.strip())
     if not text:
         return []
 
-    sentences = re.split(r"(?<=[.!?])\s+", text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
+    # Token counts computed once; the sweep below only moves indices
+    # (the chunk being built is sentences[start:end]) and each chunk is
+    # joined straight from one slice of the sentence list
+    sizes = [estimate_tokens(sentence) for sentence in sentences]
     chunks: list[str] = []
-    current_chunk: list[str] = []
+    start = 0
     current_tokens = 0
 
-    for sentence in sentences:
-        sentence_tokens = estimate_tokens(sentence)
-
-        if current_tokens + sentence_tokens > chunk_size and current_chunk:
-            chunk_text_str = " ".join(current_chunk)
-            chunks.append(chunk_text_str)
-
-            # Build overlap from the end of current chunk
-            overlap_chunk: list[str] = []
-            overlap_tokens = 0
-            for s in reversed(current_chunk):
-                s_tokens = estimate_tokens(s)
-                if overlap_tokens + s_tokens > overlap:
-                    break
-                overlap_chunk.insert(0, s)
-                overlap_tokens += s_tokens
+    for end, sentence_tokens in enumerate(sizes):
+        if current_tokens + sentence_tokens > chunk_size and end > start:
+            chunks.append(" ".join(sentences[start:end]))
 
-            current_chunk = overlap_chunk
-            current_tokens = overlap_tokens
+            # Overlap = the longest tail of the flushed chunk within budget
+            new_start = end
+            current_tokens = 0
+            while new_start > start and current_tokens + sizes[new_start - 1] <= overlap:
+                new_start -= 1
+                current_tokens += sizes[new_start]
+            start = new_start
 
-        current_chunk.append(sentence)
         current_tokens += sentence_tokens
 
-    if current_chunk:
-        chunks.append(" ".join(current_chunk))
+    if start < len(sentences):
+        chunks.append(" ".join(sentences[start:]))
 
     return chunks
@@ -6,6 +6,7 @@ import time
 import logging
 from typing import Optional
 
+import torch
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
@@ -29,7 +30,10 @@ def embed_texts(texts: list[str]) -> list[list[float]]:
     """Embed a batch of texts, returning vectors."""
     model = get_model()
     start = time.perf_counter()
-    embeddings = model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+    # inference_mode also skips autograd's version/view tracking, which
+    # no_grad (what some sentence-transformers releases use) still does
+    with torch.inference_mode():
+        embeddings = model.encode(texts, normalize_embeddings=True, show_progress_bar=False)
     elapsed_ms = (time.perf_counter() - start) * 1000
     logger.info(
         "Embedded %d texts in %.1f ms (%.1f ms/text)",
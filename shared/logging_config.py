@@ -2,19 +2,31 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import sys
 from datetime import datetime, timezone
 
+try:
+    import orjson
+
+    def _dumps(obj: dict) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:  # shared/ is also imported by services without orjson
+    from json import dumps as _dumps
+
+# Structured fields copied from a record's `extra=` when present
+_EXTRA_FIELDS = ("latency_ms", "retrieval_scores", "token_estimate", "embedding_time_ms")
+_MISSING = object()
+
 
 class JSONFormatter(logging.Formatter):
     """Outputs log records as single-line JSON."""
 
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # The record's own creation time — no clock read per format
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -22,10 +34,12 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info and record.exc_info[0] is not None:
             log_entry["exception"] = self.formatException(record.exc_info)
         # Attach extra structured fields if present
-        for key in ("latency_ms", "retrieval_scores", "token_estimate", "embedding_time_ms"):
-            if hasattr(record, key):
-                log_entry[key] = getattr(record, key)
-        return json.dumps(log_entry)
+        # (one attribute lookup per field, not hasattr() then getattr())
+        for key in _EXTRA_FIELDS:
+            value = getattr(record, key, _MISSING)
+            if value is not _MISSING:
+                log_entry[key] = value
+        return _dumps(log_entry)
 
 
 def setup_logging() -> None:
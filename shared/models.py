@@ -99,6 +99,7 @@ class AgentRequest(BaseModel):
     query: str
     session_id: str = "default"
     job_id: Optional[str] = None
+    stream: bool = False  # True → NDJSON answer deltas instead of one JSON body
 
 
 class AgentResponse(BaseModel):